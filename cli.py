@@ -0,0 +1,216 @@
+"""Headless entry point for the Titan EA data, training and optimization jobs
+
+    python cli.py ingest [--data-dir data] [--force]
+    python cli.py features USDJPY [XAUUSD ...] [--timeframe H1] [--start 2023-01-01] [--end ...]
+    python cli.py train USDJPY [...] [--timeframe M1] [--retrain]
+    python cli.py backtest USDJPY [...] --take-profit 200 --stop-loss 150 [--lots 0.01]
+    python cli.py sweep strategy.set USDJPY [...] [--method grid|halving|hyperband|...] [--export-dir out]
+
+Every command prints one JSON document on stdout (progress messages go to
+stderr) and exits non-zero if any symbol failed, so nightly runs can be
+scripted from cron. Nothing heavier than argparse is imported before a
+command runs.
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+from contextlib import redirect_stdout
+
+# The ML modules import each other flat
+ML_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'ml')
+
+
+def load_data(symbol, args):
+    """M1 history from the binary cache built by `ingest` (the CSV files for months it lacks)"""
+    from history_loader import load_history
+    from timeframe_store import resample_ohlcv
+
+    data = load_history(symbol, args.start, args.end, data_dir=args.data_dir)
+    if args.timeframe != 'M1':
+        data = resample_ohlcv(data, args.timeframe)
+    return data
+
+
+def json_value(value):
+    """value as strict JSON data: numpy types as Python ones, NaN as null, infinities as 'inf'/'-inf'"""
+    if isinstance(value, dict):
+        return {str(key): json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_value(item) for item in value]
+    if hasattr(value, 'tolist'):
+        return json_value(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        if math.isnan(value):
+            return None
+        return 'inf' if value > 0 else '-inf'
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def backtest_summary(result):
+    """Backtest result without the per-bar equity curve and trade list"""
+    return {key: value for key, value in result.items() if key not in ('equity', 'trades')}
+
+
+def command_ingest(args):
+    from history_cache import HistoryCache
+
+    cache = HistoryCache(args.data_dir)
+    converted = cache.ingest(force=args.force)
+    return {
+        'converted': converted,
+        'months': len(cache.manifest),
+        'rows': sum(entry['rows'] for entry in cache.manifest.values())
+    }
+
+
+def symbol_features(symbol, args):
+    from feature_engineering import FeatureStore
+    from batch_features import DEFAULT_SPECS
+
+    data = load_data(symbol, args)
+    added = FeatureStore(args.feature_dir).update(symbol, args.timeframe, data, DEFAULT_SPECS)
+    return {'bars': len(data), 'new_rows': added}
+
+
+def symbol_train(symbol, args):
+    from trainer import ModelTrainer
+
+    data = load_data(symbol, args)
+    metrics = ModelTrainer().train_model(data, symbol, args.timeframe, retrain=args.retrain)
+    if metrics is None:
+        raise Exception(f"Training failed for {symbol} {args.timeframe}")
+    return {'bars': len(data), 'metrics': {key: value for key, value in metrics.items() if key != 'folds'}}
+
+
+def symbol_backtest(symbol, args):
+    from trainer import ModelTrainer
+    from core.backtest_analyzer import TitanBacktestAnalyzer
+
+    data = load_data(symbol, args)
+    signals = ModelTrainer().signals(data, symbol, args.timeframe)
+    result = TitanBacktestAnalyzer(data).run(signals, args.take_profit, args.stop_loss, lots=args.lots)
+    if result is None:
+        raise Exception("Backtest failed")
+    return backtest_summary(result)
+
+
+def symbol_sweep(symbol, args):
+    from set_file import parse_set_file, SetTemplate
+    from trainer import ModelTrainer
+    from strategy_optimizer import TitanStrategyOptimizer, backtest_ranges
+
+    set_file = parse_set_file(args.set_file)
+    # The model's signals take no strategy parameters, only the backtest ones are swept
+    ranges, ignored = backtest_ranges(set_file.ranges())
+    if not ranges:
+        raise Exception(f"No optimizable backtest parameters (TP/SL/lots/spread) in {args.set_file}")
+
+    data = load_data(symbol, args)
+    signals = ModelTrainer().signals(data, symbol, args.timeframe)
+    optimizer = TitanStrategyOptimizer(data, signals=signals, metric=args.metric, max_workers=args.workers)
+    if args.method == 'grid':
+        top = optimizer.optimize(ranges, top_n=args.top)[:args.top]
+    else:
+        search = optimizer.search(ranges, method=args.method, max_seconds=args.max_seconds,
+                                  max_fits=args.max_fits)
+        top = [{'parameters': search['best_params'], args.metric: search['best_score']}]
+
+    output = {'bars': len(data), 'top': top, 'ignored': ignored}
+    if args.export_dir:
+        directory = os.path.join(args.export_dir, symbol, args.timeframe)
+        output['exported'] = SetTemplate(set_file).write_variants(
+            (result['parameters'] for result in top), directory
+        )
+    return output
+
+
+def per_symbol(func):
+    """Run func(symbol, args) for every symbol, collecting results and errors instead of stopping"""
+    def command(args):
+        results, ok = {}, True
+        for symbol in args.symbols:
+            start = time.perf_counter()
+            try:
+                results[symbol] = func(symbol, args)
+            except Exception as e:
+                ok = False
+                results[symbol] = {'error': str(e)}
+            results[symbol]['seconds'] = round(time.perf_counter() - start, 3)
+        return {'symbols': results, 'ok': ok}
+    return command
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description="Titan EA headless jobs, JSON on stdout")
+    parser.add_argument('--output', help="Also write the JSON result to this file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest = subparsers.add_parser('ingest', help="Convert the monthly CSV archive into the binary cache")
+    ingest.add_argument('--data-dir', default='data')
+    ingest.add_argument('--force', action='store_true', help="Reconvert months that are up to date")
+    ingest.set_defaults(func=command_ingest)
+
+    def symbol_command(name, func, help_text):
+        sub = subparsers.add_parser(name, help=help_text)
+        if name == 'sweep':
+            sub.add_argument('set_file', help="SET file whose Y-flagged ranges are swept")
+        sub.add_argument('symbols', nargs='+')
+        sub.add_argument('--timeframe', default='M1')
+        sub.add_argument('--start', help="First day of history (default: all)")
+        sub.add_argument('--end', help="Last day of history, included in full (default: all)")
+        sub.add_argument('--data-dir', default='data')
+        sub.set_defaults(func=per_symbol(func))
+        return sub
+
+    features = symbol_command('features', symbol_features, "Bring the feature store up to date")
+    features.add_argument('--feature-dir', default='feature_store')
+
+    train = symbol_command('train', symbol_train, "Train (or reuse) the model for each symbol")
+    train.add_argument('--retrain', action='store_true')
+
+    backtest = symbol_command('backtest', symbol_backtest, "Backtest the model's signals with fixed TP/SL")
+    backtest.add_argument('--take-profit', type=float, required=True, help="Points")
+    backtest.add_argument('--stop-loss', type=float, required=True, help="Points")
+    backtest.add_argument('--lots', type=float, default=0.01)
+
+    sweep = symbol_command('sweep', symbol_sweep, "Optimize the SET file ranges on each symbol")
+    sweep.add_argument('--method', default='grid',
+                       choices=['grid', 'random', 'halving', 'hyperband', 'tpe'])
+    sweep.add_argument('--metric', default='net_profit')
+    sweep.add_argument('--top', type=int, default=10)
+    sweep.add_argument('--workers', type=int)
+    sweep.add_argument('--max-seconds', type=float)
+    sweep.add_argument('--max-fits', type=int)
+    sweep.add_argument('--export-dir', help="Write the top results as SET files here")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if ML_DIR not in sys.path:
+        sys.path.insert(0, ML_DIR)
+
+    start = time.perf_counter()
+    # Library progress output would corrupt the JSON document
+    with redirect_stdout(sys.stderr):
+        try:
+            result = args.func(args)
+        except Exception as e:
+            result = {'error': str(e), 'ok': False}
+    result = dict({'command': args.command, 'seconds': round(time.perf_counter() - start, 3)}, **result)
+
+    text = json.dumps(json_value(result), indent=2, allow_nan=False)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    return 0 if result.get('ok', True) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import time
+from datetime import datetime, timezone
+import numpy as np
+
+# MetaTrader5.TIMEFRAME_M1, usable as a default without importing the package
+TIMEFRAME_M1 = 1
+
+# Bar length in seconds for the MetaTrader5 TIMEFRAME_* constants
+TIMEFRAME_SECONDS = {
+    1: 60, 2: 120, 3: 180, 4: 240, 5: 300, 6: 360, 10: 600, 12: 720,
+    15: 900, 20: 1200, 30: 1800,
+    16385: 3600, 16386: 7200, 16387: 10800, 16388: 14400,
+    16390: 21600, 16392: 28800, 16396: 43200, 16408: 86400
+}
+
+
+def to_timestamp(value):
+    """Seconds since the epoch for an int or a datetime (naive datetimes are taken as UTC)"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+class MT5TerminalAdapter:
+    """Pass-through to the MetaTrader5 package used by BarStream"""
+
+    def __init__(self):
+        import MetaTrader5 as mt5
+        self.mt5 = mt5
+
+    def initialize(self):
+        return self.mt5.initialize()
+
+    def shutdown(self):
+        self.mt5.shutdown()
+
+    def last_error(self):
+        return self.mt5.last_error()
+
+    def login(self, login, password, server):
+        return self.mt5.login(login=login, password=password, server=server)
+
+    def symbol_select(self, symbol, enable=True):
+        return self.mt5.symbol_select(symbol, enable)
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        return self.mt5.copy_rates_from_pos(symbol, timeframe, start_pos, count)
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        return self.mt5.copy_rates_range(symbol, timeframe, date_from, date_to)
+
+    def server_time(self, symbol):
+        """Trade server time in seconds, taken from the last tick"""
+        tick = self.mt5.symbol_info_tick(symbol)
+        return tick.time if tick is not None else None
+
+
+class ReplayTerminalAdapter:
+    """Replays recorded MT5 rates as a live feed, driven by a simulated server clock
+
+    Pass sleep() to BarStream so that waiting advances the clock instead of
+    blocking; the bar whose open time is the latest one at or before the clock
+    is the forming bar, everything older is closed.
+    """
+
+    def __init__(self, rates, timeframe_seconds=60, start_time=None):
+        self.rates = np.sort(np.asarray(rates), order='time')
+        self.period = timeframe_seconds
+        self.times = self.rates['time'].astype(np.int64)
+        self.clock = int(start_time if start_time is not None else self.times[0])
+        self.calls = 0
+
+    def initialize(self):
+        return True
+
+    def shutdown(self):
+        pass
+
+    def last_error(self):
+        return (1, 'Success')
+
+    def symbol_select(self, symbol, enable=True):
+        return True
+
+    def sleep(self, seconds):
+        self.clock += max(int(np.ceil(seconds)), 1)
+
+    @property
+    def exhausted(self):
+        return self.clock >= self.times[-1] + self.period
+
+    def _visible(self):
+        return int(np.searchsorted(self.times, self.clock, side='right'))
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        self.calls += 1
+        end = self._visible() - start_pos
+        if end <= 0:
+            return None
+        return self.rates[max(end - count, 0):end]
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        self.calls += 1
+        visible = self._visible()
+        lo = np.searchsorted(self.times[:visible], to_timestamp(date_from), side='left')
+        hi = np.searchsorted(self.times[:visible], to_timestamp(date_to), side='right')
+        return self.rates[lo:hi]
+
+    def server_time(self, symbol):
+        return self.clock
+
+
+class BarStream:
+    """Yields newly closed bars as soon as they close, without fixed-interval polling
+
+    Each poll asks the terminal for the forming bar only and compares its raw
+    integer open time with the last delivered bar; the closed bars in between
+    are then fetched with a range request for exactly that gap. Between polls
+    the stream sleeps until shortly before the next expected bar close, then
+    polls with a growing back-off until the new bar shows up (this also keeps
+    polling cheap over weekends and holidays).
+    """
+
+    def __init__(self, symbol, timeframe, adapter=None, sleep=time.sleep,
+                 close_lead=1.0, min_delay=0.1, max_delay=30.0, error_delay=5.0):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.period = TIMEFRAME_SECONDS[timeframe]
+        self.adapter = adapter if adapter is not None else MT5TerminalAdapter()
+        self.sleep = sleep
+        self.close_lead = close_lead
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.error_delay = error_delay
+        self.last_time = None
+        self.forming_time = None
+        self.backoff = min_delay
+
+    def prime(self, bars=100):
+        """Fetch the latest closed bars and start streaming after them"""
+        rates = self.adapter.copy_rates_from_pos(self.symbol, self.timeframe, 1, bars)
+        if rates is None:
+            raise Exception(f"Failed to get market data: {self.adapter.last_error()}")
+        if len(rates):
+            self.last_time = int(rates['time'][-1])
+        return rates
+
+    def poll(self):
+        """Return the bars closed since the last poll (possibly empty)"""
+        forming = self.adapter.copy_rates_from_pos(self.symbol, self.timeframe, 0, 1)
+        if forming is None or len(forming) == 0:
+            raise Exception(f"Failed to get market data: {self.adapter.last_error()}")
+        forming_time = int(forming['time'][-1])
+        self.forming_time = forming_time
+
+        if self.last_time is None:
+            return self.prime(1)
+        if forming_time <= self.last_time + self.period:
+            return forming[:0]
+
+        rates = self.adapter.copy_rates_range(
+            self.symbol, self.timeframe, self.last_time + 1, forming_time - 1
+        )
+        if rates is None:
+            raise Exception(f"Failed to get market data: {self.adapter.last_error()}")
+
+        times = rates['time']
+        rates = rates[(times > self.last_time) & (times < forming_time)]
+        if len(rates):
+            self.last_time = int(rates['time'][-1])
+        return rates
+
+    def next_delay(self, received):
+        """Seconds to wait before the next poll"""
+        if received:
+            self.backoff = self.min_delay
+
+        now = self.adapter.server_time(self.symbol)
+        if now is None or self.forming_time is None:
+            return self.min_delay
+
+        until_close = self.forming_time + self.period - now
+        if until_close > self.close_lead:
+            # Nothing can close before then, sleep through the bar
+            return min(until_close - self.close_lead, self.max_delay)
+
+        # Around the close: poll quickly, slowing down while the bar is late
+        delay = self.backoff
+        self.backoff = min(self.backoff * 2, self.max_delay)
+        return delay
+
+    def stream(self):
+        """Generator of structured arrays holding only newly closed bars"""
+        while True:
+            try:
+                rates = self.poll()
+            except Exception as e:
+                print(f"Error streaming data: {str(e)}")
+                self.sleep(self.error_delay)
+                continue
+
+            if len(rates):
+                yield rates
+            self.sleep(self.next_delay(len(rates) > 0))
@@ -1,40 +1,32 @@
-import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
-import time
 from datetime import datetime
+from bar_stream import TIMEFRAME_M1, BarStream
 
 class DataStreamer:
-    def __init__(self, symbol="USDJPY", timeframe=mt5.TIMEFRAME_M1):
+    def __init__(self, symbol="USDJPY", timeframe=TIMEFRAME_M1, adapter=None):
         self.symbol = symbol
         self.timeframe = timeframe
         self.last_time = None
+        self.bar_stream = BarStream(symbol, timeframe, adapter=adapter)
         
     def initialize(self):
+        # Imported on first use, the package is Windows only and slow to load
+        import MetaTrader5 as mt5
         if not mt5.initialize():
             raise Exception(f"MT5 initialization failed: {mt5.last_error()}")
         print("MT5 initialized successfully")
     
     def stream_data(self, bars=100):
-        """Stream market data continuously"""
-        while True:
-            try:
-                # Get current data
-                rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, bars)
-                if rates is None:
-                    raise Exception("Failed to get market data")
-                
-                df = pd.DataFrame(rates)
-                df['time'] = pd.to_datetime(df['time'], unit='s')
-                
-                # Check if we have new data
-                current_time = df['time'].iloc[-1]
-                if self.last_time != current_time:
-                    self.last_time = current_time
-                    print(f"New data received at: {current_time}")
-                    yield df
-                    
-                time.sleep(1)  # Wait 1 second before next check
-                
-            except Exception as e:
-                print(f"Error streaming data: {str(e)}")
-                time.sleep(5)  # Wait longer on error
+        """Stream a rolling window of the last closed bars, once per new bar"""
+        window = self.bar_stream.prime(bars)
+        
+        for new_rates in self.bar_stream.stream():
+            window = np.concatenate([window, new_rates])[-bars:]
+            
+            # Only build a DataFrame once there really is a new bar
+            df = pd.DataFrame(window)
+            df['time'] = pd.to_datetime(df['time'], unit='s')
+            self.last_time = df['time'].iloc[-1]
+            print(f"New data received at: {self.last_time}")
+            yield df
@@ -0,0 +1,127 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+import numpy as np
+from bar_stream import MT5TerminalAdapter, to_timestamp
+
+
+class HistoryDownloader:
+    """Resumable chunked download of MT5 rates into a local store
+
+    The requested range is cut into fixed chunks aligned to the epoch, so the
+    same chunk always maps to the same file. Every chunk is written to disk as
+    soon as it arrives; chunks that ended before the server clock and returned
+    bars are final and never requested again, while the chunk holding the
+    newest bars (or one that came back empty) is kept as a .partial file and
+    requested again on the next run. An interrupted download simply resumes
+    with the chunks that are still missing.
+
+    The MetaTrader5 package must not be called from several threads at once:
+    requests go one at a time through a single terminal thread (holding lock,
+    which callers sharing the adapter can pass in), and only the disk writes
+    overlap with the next request.
+    """
+
+    def __init__(self, adapter=None, store_dir='history_store', chunk_days=3, lock=None):
+        self.adapter = adapter if adapter is not None else MT5TerminalAdapter()
+        self.store_dir = store_dir
+        self.chunk_seconds = int(chunk_days * 86400)
+        self.lock = lock if lock is not None else threading.Lock()
+
+    def chunk_bounds(self, start, end):
+        """Epoch-aligned [lo, hi) chunks covering [start, end]"""
+        first = (start // self.chunk_seconds) * self.chunk_seconds
+        return [(lo, lo + self.chunk_seconds) for lo in range(first, end + 1, self.chunk_seconds)]
+
+    def series_dir(self, symbol, timeframe):
+        return os.path.join(self.store_dir, symbol, str(timeframe))
+
+    def chunk_path(self, symbol, timeframe, lo, hi, partial=False):
+        suffix = '.partial.npy' if partial else '.npy'
+        return os.path.join(self.series_dir(symbol, timeframe), f"{lo}_{hi}{suffix}")
+
+    def missing_chunks(self, symbol, timeframe, start, end, now):
+        """Chunks without a final file on disk, plus any chunk that is still open"""
+        missing = []
+        for lo, hi in self.chunk_bounds(start, end):
+            if hi > now or not os.path.exists(self.chunk_path(symbol, timeframe, lo, hi)):
+                missing.append((lo, hi))
+        return missing
+
+    def _fetch_chunk(self, symbol, timeframe, lo, hi):
+        with self.lock:
+            rates = self.adapter.copy_rates_range(
+                symbol,
+                timeframe,
+                datetime.fromtimestamp(lo, tz=timezone.utc),
+                datetime.fromtimestamp(hi - 1, tz=timezone.utc)
+            )
+            if rates is None:
+                raise Exception(f"Failed to fetch {symbol} {lo}-{hi}: {self.adapter.last_error()}")
+        return rates
+
+    def _save_chunk(self, rates, symbol, timeframe, lo, hi, partial):
+        path = self.chunk_path(symbol, timeframe, lo, hi, partial)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, rates)
+        os.replace(tmp_path, path)
+
+        # A chunk that has become final replaces its partial version
+        partial_path = self.chunk_path(symbol, timeframe, lo, hi, partial=True)
+        if not partial and os.path.exists(partial_path):
+            os.remove(partial_path)
+
+    def download(self, symbol, timeframe, start, end=None):
+        """Bring the store up to date for [start, end] and return those rates"""
+        with self.lock:
+            now = self.adapter.server_time(symbol)
+        if now is None:
+            now = int(datetime.now(timezone.utc).timestamp())
+        start = to_timestamp(start)
+        end = to_timestamp(end) if end is not None else now
+
+        os.makedirs(self.series_dir(symbol, timeframe), exist_ok=True)
+        missing = self.missing_chunks(symbol, timeframe, start, end, now)
+        print(f"{symbol}: {len(missing)} chunk(s) to fetch, "
+              f"{len(self.chunk_bounds(start, end)) - len(missing)} already stored")
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='mt5') as executor:
+            futures = {
+                executor.submit(self._fetch_chunk, symbol, timeframe, lo, hi): (lo, hi)
+                for lo, hi in missing
+            }
+            for future in as_completed(futures):
+                lo, hi = futures[future]
+                try:
+                    rates = future.result()
+                except Exception as e:
+                    print(f"Error downloading chunk: {str(e)}")
+                    continue
+                # An empty closed chunk may be a terminal that has not synced yet, so it stays partial
+                self._save_chunk(rates, symbol, timeframe, lo, hi, partial=hi > now or len(rates) == 0)
+                print(f"Stored {len(rates)} records for "
+                      f"{datetime.fromtimestamp(lo, tz=timezone.utc):%Y-%m-%d}")
+
+        return self.load(symbol, timeframe, start, end)
+
+    def load(self, symbol, timeframe, start, end):
+        """Read the stored rates for [start, end] without touching the terminal"""
+        start = to_timestamp(start)
+        end = to_timestamp(end)
+        parts = []
+        for lo, hi in self.chunk_bounds(start, end):
+            for partial in (False, True):
+                path = self.chunk_path(symbol, timeframe, lo, hi, partial)
+                if os.path.exists(path):
+                    parts.append(np.load(path))
+                    break
+
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return None
+
+        rates = np.concatenate(parts)
+        times = rates['time']
+        return rates[(times >= start) & (times <= end)]
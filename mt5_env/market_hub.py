@@ -0,0 +1,115 @@
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from bar_stream import BarStream, MT5TerminalAdapter
+
+BarEvent = namedtuple('BarEvent', ['symbol', 'timeframe', 'rates'])
+
+
+class MarketDataHub:
+    """Multiplexes closed-bar streams for many symbols/timeframes over one terminal session
+
+    All terminal calls run in a small dedicated thread pool (one worker by
+    default, the MetaTrader5 package is not safe to call concurrently), so the
+    event loop never blocks on them. Each (symbol, timeframe) pair gets one
+    polling task no matter how many subscribers it has; bars are fanned out to
+    bounded asyncio queues, and a full queue makes its stream wait for the
+    consumer instead of buffering without limit.
+    """
+
+    def __init__(self, adapter=None, max_workers=1, queue_size=1000, sleep=asyncio.sleep):
+        self.adapter = adapter
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='mt5')
+        self.queue_size = queue_size
+        self.sleep = sleep
+        self.streams = {}
+        self.subscribers = {}
+        self.tasks = {}
+        self.started = False
+
+    async def call(self, func, *args):
+        """Run a blocking terminal call in the hub's executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def start(self):
+        """Open the single terminal session and start any pending streams"""
+        if self.started:
+            return
+        if self.adapter is None:
+            self.adapter = await self.call(MT5TerminalAdapter)
+        if not await self.call(self.adapter.initialize):
+            error = await self.call(self.adapter.last_error)
+            raise Exception(f"MT5 initialization failed: {error}")
+        self.started = True
+        for key in self.subscribers:
+            self._ensure_task(key)
+
+    async def stop(self):
+        """Cancel all streams and close the terminal session"""
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.tasks.clear()
+        if self.started:
+            await self.call(self.adapter.shutdown)
+            self.started = False
+        self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def subscribe(self, symbol, timeframe, queue_size=None):
+        """Return a queue receiving a BarEvent for every newly closed bar batch"""
+        key = (symbol, timeframe)
+        queue = asyncio.Queue(maxsize=queue_size or self.queue_size)
+        self.subscribers.setdefault(key, []).append(queue)
+        if self.started:
+            self._ensure_task(key)
+        return queue
+
+    def unsubscribe(self, symbol, timeframe, queue):
+        """Detach a queue; the stream stops when its last subscriber leaves"""
+        key = (symbol, timeframe)
+        queues = self.subscribers.get(key, [])
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self.subscribers.pop(key, None)
+            task = self.tasks.pop(key, None)
+            if task is not None:
+                task.cancel()
+
+    def _ensure_task(self, key):
+        if key not in self.tasks:
+            self.tasks[key] = asyncio.get_running_loop().create_task(self._run_stream(key))
+
+    async def _run_stream(self, key):
+        symbol, timeframe = key
+        stream = BarStream(symbol, timeframe, adapter=self.adapter)
+        self.streams[key] = stream
+
+        await self.call(self.adapter.symbol_select, symbol, True)
+
+        while True:
+            try:
+                rates = await self.call(stream.poll)
+            except Exception as e:
+                print(f"Error streaming {symbol}: {str(e)}")
+                await self.sleep(stream.error_delay)
+                continue
+
+            if len(rates):
+                event = BarEvent(symbol, timeframe, rates)
+                # put() waits on a full queue, which is the backpressure
+                for queue in list(self.subscribers.get(key, [])):
+                    await queue.put(event)
+
+            # next_delay() reads the server clock, so it is a terminal call too
+            delay = await self.call(stream.next_delay, len(rates) > 0)
+            await self.sleep(delay)
@@ -0,0 +1,12 @@
+"""Makes the shared modules in src/ml importable from the mt5_env scripts
+
+    import ml_path  # before the first flat import of a src/ml module
+"""
+import os
+import sys
+
+ML_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'ml')
+
+# Appended, so the mt5_env modules keep precedence over same-named ones in src/ml
+if ML_DIR not in sys.path:
+    sys.path.append(ML_DIR)
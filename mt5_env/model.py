@@ -1,18 +1,29 @@
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, precision_score, recall_score
-
 class TitanMLModel:
     def __init__(self):
-        self.model = RandomForestClassifier(
+        self.model_params = dict(
             n_estimators=100,
             max_depth=10,
             random_state=42
         )
+        self._model = None
         self.feature_columns = ['RSI', 'MA20', 'MA50', 'ATR', 'Price_Range', 'Price_Change']
 
+    @property
+    def model(self):
+        """The RandomForestClassifier, created on first use"""
+        if self._model is None:
+            # sklearn takes seconds to import, it is loaded when the first model is built
+            from sklearn.ensemble import RandomForestClassifier
+            self._model = RandomForestClassifier(**self.model_params)
+        return self._model
+
+    @model.setter
+    def model(self, estimator):
+        self._model = estimator
+
     def train(self, X, y):
         """Train the model"""
+        from sklearn.model_selection import train_test_split
         X_train, X_test, y_train, y_test = train_test_split(
             X[self.feature_columns], y, test_size=0.2, random_state=42
         )
@@ -25,9 +36,10 @@ class TitanMLModel:
 
     def evaluate(self, X_test, y_test):
         """Evaluate model performance"""
+        from sklearn import metrics
         predictions = self.predict(X_test)
         return {
-            'accuracy': accuracy_score(y_test, predictions),
-            'precision': precision_score(y_test, predictions, average='weighted'),
-            'recall': recall_score(y_test, predictions, average='weighted')
+            'accuracy': metrics.accuracy_score(y_test, predictions),
+            'precision': metrics.precision_score(y_test, predictions, average='weighted'),
+            'recall': metrics.recall_score(y_test, predictions, average='weighted')
         }
@@ -1,4 +1,3 @@
-import MetaTrader5 as mt5
 import pandas as pd
 from datetime import datetime
 
@@ -8,6 +7,8 @@ class MT5Connector:
         
     def initialize_mt5(self):
         """Initialize MT5 connection"""
+        # Imported on first use, the package is Windows only and slow to load
+        import MetaTrader5 as mt5
         if not mt5.initialize():
             print(f"MT5 initialization failed: {mt5.last_error()}")
             return False
@@ -21,7 +22,9 @@ class MT5Connector:
         if not self.connected:
             print("MT5 not initialized")
             return False
-            
+        
+        import MetaTrader5 as mt5
+        
         authorized = mt5.login(login=login, 
                              password=password,
                              server=server)
@@ -41,7 +44,8 @@ class MT5Connector:
         """Fetch real-time market data"""
         if not self.connected:
             return None
-            
+        
+        import MetaTrader5 as mt5
         rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, n_bars)
         if rates is not None:
             df = pd.DataFrame(rates)
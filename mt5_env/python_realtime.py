@@ -1,16 +1,18 @@
-import MetaTrader5 as mt5
 import pandas as pd
-import time
 from datetime import datetime
+from bar_stream import TIMEFRAME_M1, BarStream
 
 class MT5RealTime:
-    def __init__(self, symbol="USDJPY", timeframe=mt5.TIMEFRAME_M1):
+    def __init__(self, symbol="USDJPY", timeframe=TIMEFRAME_M1, adapter=None):
         self.symbol = symbol
         self.timeframe = timeframe
         self.last_time = None
+        self.bar_stream = BarStream(symbol, timeframe, adapter=adapter)
         
     def initialize(self):
         """Initialize MT5 connection"""
+        # Imported on first use, the package is Windows only and slow to load
+        import MetaTrader5 as mt5
         if not mt5.initialize():
             raise Exception(f"MT5 initialization failed: {mt5.last_error()}")
         print("MT5 initialized successfully")
@@ -18,47 +20,43 @@ class MT5RealTime:
     
     def get_realtime_data(self, bars=100):
         """Get current market data"""
+        import MetaTrader5 as mt5
         try:
             rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, bars)
             if rates is None:
                 raise Exception("Failed to get market data")
             
-            df = pd.DataFrame(rates)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            df.set_index('time', inplace=True)
-            
-            # Rename columns to match existing pipeline
-            df = df.rename(columns={
-                'open': 'Open',
-                'high': 'High',
-                'low': 'Low',
-                'close': 'Close',
-                'tick_volume': 'Volume'
-            })
-            
-            return df
+            return self.rates_to_frame(rates)
             
         except Exception as e:
             print(f"Error getting real-time data: {str(e)}")
             return None
-
+    
+    def rates_to_frame(self, rates):
+        """Convert MT5 rates into a time-indexed DataFrame"""
+        df = pd.DataFrame(rates)
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        df.set_index('time', inplace=True)
+        
+        # Rename columns to match existing pipeline
+        df = df.rename(columns={
+            'open': 'Open',
+            'high': 'High',
+            'low': 'Low',
+            'close': 'Close',
+            'tick_volume': 'Volume'
+        })
+        
+        return df
+    
     def stream_data(self):
-        """Stream market data continuously"""
-        while True:
-            try:
-                current_data = self.get_realtime_data(bars=1)
-                if current_data is not None:
-                    current_time = current_data.index[-1]
-                    if self.last_time != current_time:
-                        self.last_time = current_time
-                        print(f"\nNew data at: {current_time}")
-                        print(current_data)
-                        yield current_data
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"Error streaming data: {str(e)}")
-                time.sleep(5)
+        """Stream newly closed bars as they close"""
+        for rates in self.bar_stream.stream():
+            current_data = self.rates_to_frame(rates)
+            self.last_time = current_data.index[-1]
+            print(f"\nNew data at: {self.last_time}")
+            print(current_data)
+            yield current_data
 
 if __name__ == "__main__":
     try:
@@ -70,4 +68,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\nStreaming stopped by user")
     finally:
+        import MetaTrader5 as mt5
         mt5.shutdown()
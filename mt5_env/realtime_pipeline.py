@@ -1,9 +1,26 @@
-import MetaTrader5 as mt5
-import pandas as pd
-from datetime import datetime, timedelta
-from data_processor import TitanDataProcessor
+from datetime import datetime, timedelta, timezone
+import ml_path  # puts src/ml on sys.path
+from data_processor import TitanDataProcessor, mt5_rates_to_frame
 from model import TitanMLModel
-import time
+from history_downloader import HistoryDownloader
+from timeframe_store import TimeframeStore
+from strategy_optimizer import TitanStrategyOptimizer, backtest_ranges
+from model_registry import ModelRegistry, cutoff_version
+from set_file import parse_set_file, SetTemplate
+
+# A registered model younger than this is reused instead of downloading and retraining
+MODEL_MAX_AGE = timedelta(days=1)
+
+# Section titles of the SET file mapped to the settings groups, first match wins
+SETTINGS_SECTIONS = [
+    ('basic', 'basic'),
+    ('entry', 'entry'),
+    ('exit', 'exit'),
+    ('take profit', 'take_profit'),
+    ('stop loss', 'stop_loss'),
+    ('schedule', 'schedule'),
+    ('news', 'news')
+]
 
 class TitanSetFileParser:
     def __init__(self):
@@ -16,39 +33,24 @@ class TitanSetFileParser:
             'schedule': {},
             'news': {}
         }
+        # Optimization ranges of the parameters flagged Y: {'current', 'min', 'step', 'max'}
+        self.ranges = {}
+        self.set_file = None
         
     def read_set_file(self, filepath):
         try:
-            with open(filepath, 'r') as file:
-                current_section = 'basic'
-                for line in file:
-                    line = line.strip()
-                    if not line or line.startswith(';'):
-                        continue
-                        
-                    if line.startswith('=====') and line.endswith('====='):
-                        section_name = line.replace('=', '').strip().lower()
-                        if 'basic' in section_name:
-                            current_section = 'basic'
-                        elif 'entry' in section_name:
-                            current_section = 'entry'
-                        elif 'exit' in section_name:
-                            current_section = 'exit'
-                        elif 'take profit' in section_name:
-                            current_section = 'take_profit'
-                        elif 'stop loss' in section_name:
-                            current_section = 'stop_loss'
-                        elif 'schedule' in section_name:
-                            current_section = 'schedule'
-                        elif 'news' in section_name:
-                            current_section = 'news'
-                        continue
-                        
-                    if '=' in line:
-                        name, value = line.split('=', 1)
-                        if '||' in value:
-                            value = value.split('||')[0]
-                        self.settings[current_section][name] = value
+            self.set_file = parse_set_file(filepath)
+            current_section = 'basic'
+            groups = {}
+            for param in self.set_file:
+                if param.section not in groups:
+                    title = param.section.lower()
+                    groups[param.section] = next(
+                        (group for key, group in SETTINGS_SECTIONS if key in title), current_section
+                    )
+                current_section = groups[param.section]
+                self.settings[current_section][param.name] = param.value
+            self.ranges.update(self.set_file.ranges())
             return True
             
         except Exception as e:
@@ -60,8 +62,18 @@ class RealtimePipeline:
         self.processor = TitanDataProcessor()
         self.model = TitanMLModel()
         self.set_parser = TitanSetFileParser()
+        self.mt5_ready = False
+        self.downloader = None
+        self.timeframes = TimeframeStore()
+        self.registry = ModelRegistry()
         
     def initialize_mt5(self):
+        # One terminal session per pipeline, not one per symbol
+        if self.mt5_ready:
+            return
+        
+        # Imported on first use, the package is Windows only and slow to load
+        import MetaTrader5 as mt5
         if not mt5.initialize():
             raise Exception(f"MT5 initialization failed: {mt5.last_error()}")
             
@@ -73,29 +85,13 @@ class RealtimePipeline:
         
         if not authorized:
             raise Exception(f"MT5 login failed: {mt5.last_error()}")
+        self.mt5_ready = True
         print("MT5 initialized and logged in successfully")
         
     def preprocess_mt5_data(self, rates):
         try:
-            df = pd.DataFrame(rates)
-            
-            if isinstance(df['time'].iloc[0], (int, float)):
-                df['DateTime'] = pd.to_datetime(df['time'], unit='s')
-            else:
-                df['DateTime'] = pd.to_datetime(df['time'])
-                
-            df.set_index('DateTime', inplace=True)
-            
-            df = df.rename(columns={
-                'open': 'Open',
-                'high': 'High',
-                'low': 'Low',
-                'close': 'Close',
-                'tick_volume': 'Volume'
-            })
-            
-            df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
-            df = df.astype(float)
+            # Column views over the MT5 record array (or DataFrame), no per-row objects
+            df = mt5_rates_to_frame(rates)
             
             print(f"Processed {len(df)} rows of data")
             print(f"Sample of processed data:\n{df.head()}")
@@ -103,73 +99,36 @@ class RealtimePipeline:
             
         except Exception as e:
             print(f"Error preprocessing data: {str(e)}")
-            print(f"First few rows of raw data:\n{df.head()}")
             raise
         
-    def get_historical_data(self, symbol):
+    def get_historical_data(self, symbol, timeframe='M1'):
         try:
             self.initialize_mt5()
             
+            import MetaTrader5 as mt5
             if not mt5.symbol_select(symbol, True):
                 raise Exception(f"Failed to select {symbol} in Market Watch")
             
             print(f"Downloading historical data for {symbol}...")
             
-            print("Fetching H4 data for full period...")
-            h4_rates = mt5.copy_rates_from(
-                symbol,
-                mt5.TIMEFRAME_H4,
-                datetime.now(),
-                2190
-            )
-            
-            if h4_rates is None or len(h4_rates) == 0:
-                raise Exception(f"Failed to fetch H4 data for {symbol}")
-            
-            h4_df = pd.DataFrame(h4_rates)
-            h4_df['time'] = pd.to_datetime(h4_df['time'], unit='s')
-            h4_df.set_index('time', inplace=True)
-            
+            # Only M1 is downloaded, every higher timeframe is resampled from it
             print("Fetching recent M1 data in chunks...")
-            m1_chunks = []
-            end_date = datetime.now()
+            end_date = datetime.now(timezone.utc)
             start_date = end_date - timedelta(days=90)
             
-            current_date = start_date
-            while current_date < end_date:
-                next_date = min(current_date + timedelta(days=3), end_date)
-                print(f"Fetching M1 data for: {current_date.strftime('%Y-%m-%d')} to {next_date.strftime('%Y-%m-%d')}")
-                
-                chunk = mt5.copy_rates_range(
-                    symbol,
-                    mt5.TIMEFRAME_M1,
-                    current_date,
-                    next_date
-                )
-                
-                if chunk is not None and len(chunk) > 0:
-                    chunk_df = pd.DataFrame(chunk)
-                    chunk_df['time'] = pd.to_datetime(chunk_df['time'], unit='s')
-                    chunk_df.set_index('time', inplace=True)
-                    m1_chunks.append(chunk_df)
-                    print(f"Fetched {len(chunk)} M1 records")
-                
-                current_date = next_date
-                time.sleep(0.1)
+            # Only the chunks missing from the local store (and the newest tail) are requested
+            if self.downloader is None:
+                self.downloader = HistoryDownloader()
+            m1_rates = self.downloader.download(symbol, mt5.TIMEFRAME_M1, start_date, end_date)
             
-            if m1_chunks:
-                print("Combining H4 and M1 data...")
-                m1_df = pd.concat(m1_chunks)
-                final_df = pd.concat([h4_df, m1_df])
-                final_df = final_df[~final_df.index.duplicated(keep='last')]
-                final_df = final_df.sort_index()
-            else:
-                print("Using H4 data only...")
-                final_df = h4_df
+            if m1_rates is None or len(m1_rates) == 0:
+                raise Exception(f"Failed to fetch M1 data for {symbol}")
+            print(f"Fetched {len(m1_rates)} M1 records")
             
-            df = self.preprocess_mt5_data(final_df.reset_index().to_dict('records'))
+            self.timeframes.put(symbol, self.preprocess_mt5_data(m1_rates))
+            df = self.timeframes.get(symbol, timeframe)
             
-            print(f"Total records: {len(df)}")
+            print(f"Total {timeframe} records: {len(df)}")
             print(f"Full date range: {df.index[0]} to {df.index[-1]}")
             
             return df
@@ -182,34 +141,63 @@ class RealtimePipeline:
         if not self.set_parser.read_set_file(set_file_path):
             return None
             
-        recommendations = {}
-        for section, params in self.set_parser.settings.items():
-            for param, value in params.items():
-                if '||' in str(value) and str(value).endswith('Y'):
-                    current_val = float(value.split('||')[0])
-                    min_val = float(value.split('||')[2])
-                    max_val = float(value.split('||')[3])
-                    recommendations[param] = {
-                        'current': current_val,
-                        'min': min_val,
-                        'max': max_val
-                    }
-        return recommendations
+        return dict(self.set_parser.ranges)
+    
+    def optimize_set_file(self, set_file_path, historical_data, signals, top_n=10, export_dir=None):
+        """Backtest every combination of the SET file's optimization ranges
+
+        With export_dir, every ranked candidate is also written there as a SET file
+        in the layout of the original.
+        """
+        ranges = self.analyze_set_file(set_file_path, historical_data)
+        if not ranges:
+            print("No optimizable parameters in SET file")
+            return None
+        # The model's signals take no strategy parameters, only the backtest ones are swept
+        ranges, ignored = backtest_ranges(ranges)
+        if ignored:
+            print(f"Not sweeping {', '.join(ignored)}: the model signals do not use them")
+        if not ranges:
+            print("No optimizable backtest parameters (TP/SL/lots/spread) in SET file")
+            return None
+        
+        optimizer = TitanStrategyOptimizer(historical_data, signals=signals)
+        results = optimizer.optimize(ranges, top_n=top_n)
+        for result in results[:top_n]:
+            print(f"{result['net_profit']:.2f} PF {result['profit_factor']:.2f} "
+                  f"trades {result['trade_count']}: {result['parameters']}")
+        
+        if export_dir:
+            template = SetTemplate(self.set_parser.set_file)
+            paths = template.write_variants((result['parameters'] for result in results), export_dir)
+            print(f"Exported {len(paths)} SET files to {export_dir}")
+        return results
+    
+    def load_model(self, symbol, timeframe='M1', max_age=MODEL_MAX_AGE):
+        """Warm start from the latest registered model if it is recent enough, else None"""
+        return self.registry.load_recent(symbol, timeframe, max_age, model=self.model, processor=self.processor)
     
     def process_symbols(self, symbols=['USDJPY', 'XAUUSD']):
         try:
             for symbol in symbols:
                 print(f"\nProcessing {symbol}...")
+                meta = self.load_model(symbol)
+                if meta is not None:
+                    print(f"Model up to date, trained {meta['created']}")
+                    continue
+                
                 historical_data = self.get_historical_data(symbol)
                 
                 if historical_data is not None:
-                    featured_data = self.processor.create_features(historical_data)
+                    featured_data = self.processor.create_features_cached(historical_data, symbol, source='mt5')
                     processed_data = self.processor.prepare_training_data(featured_data)
                     
                     y = (processed_data['Close'].shift(-1) > processed_data['Close']).astype(int)[:-1]
                     processed_data = processed_data[:-1]
                     
                     results = self.model.train(processed_data, y)
+                    self.registry.save(symbol, 'M1', cutoff_version(historical_data),
+                                       self.model, self.processor, results)
                     
                     print(f"Generated features shape: {processed_data.shape}")
                     print(f"Sample of processed data:\n{processed_data.head()}")
@@ -221,7 +209,11 @@ class RealtimePipeline:
         except Exception as e:
             print(f"Error in processing: {str(e)}")
         finally:
-            mt5.shutdown()
+            # Warm-started symbols never open a terminal session
+            if self.mt5_ready:
+                import MetaTrader5 as mt5
+                mt5.shutdown()
+            self.mt5_ready = False
 
 if __name__ == "__main__":
     pipeline = RealtimePipeline()
@@ -1,20 +1,19 @@
 import os
 import json
+import ml_path  # puts src/ml on sys.path
+from set_file import SetFile, parse_set_file, write_set_file
 
 class SetFileHandler:
     def __init__(self, set_file_path):
         self.set_file_path = set_file_path
-        self.parameters = {}
+        self.parameters = SetFile()
         self.load_set_file()
     
     def load_set_file(self):
         """Load parameters from SET file"""
         try:
-            with open(self.set_file_path, 'r') as file:
-                for line in file:
-                    if '=' in line:
-                        key, value = line.strip().split('=')
-                        self.parameters[key.strip()] = value.strip()
+            # Typed parameter table, values are already int/float/bool
+            self.parameters = parse_set_file(self.set_file_path)
             print(f"Loaded {len(self.parameters)} parameters from SET file")
         except Exception as e:
             print(f"Error loading SET file: {str(e)}")
@@ -24,8 +23,8 @@ class SetFileHandler:
         try:
             # Example parameter adjustment logic
             if predictions['trend_strength'] > 0.7:
-                self.parameters['TakeProfit'] = str(int(float(self.parameters['TakeProfit']) * 1.2))
-                self.parameters['StopLoss'] = str(int(float(self.parameters['StopLoss']) * 0.8))
+                self.parameters.set('TakeProfit', int(self.parameters.get('TakeProfit') * 1.2))
+                self.parameters.set('StopLoss', int(self.parameters.get('StopLoss') * 0.8))
             
             # Save updated parameters
             self.save_set_file()
@@ -34,11 +33,9 @@ class SetFileHandler:
             print(f"Error updating parameters: {str(e)}")
     
     def save_set_file(self):
-        """Save parameters back to SET file"""
+        """Save parameters back to SET file, keeping its layout and replacing it atomically"""
         try:
-            with open(self.set_file_path, 'w') as file:
-                for key, value in self.parameters.items():
-                    file.write(f"{key}={value}\n")
+            write_set_file(self.set_file_path, self.parameters)
             print("SET file updated successfully")
         except Exception as e:
             print(f"Error saving SET file: {str(e)}")
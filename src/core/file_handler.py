@@ -1,5 +1,5 @@
 import os
-import chardet  # Install with: pip install chardet
+from src.ml.set_file import parse_set_file
 
 class FileHandler:
     def __init__(self):
@@ -21,43 +21,15 @@ class FileHandler:
 
     def process_set_file(self, file_path):
         """Process SET file containing EA parameters."""
-        parameters = {}
         try:
-            # Detect encoding
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                detected = chardet.detect(raw_data)
-                encoding = detected['encoding']
-
-            # Read the file with the detected encoding
-            with open(file_path, 'r', encoding=encoding) as f:
-                lines = [line.strip() for line in f if line.strip()]
-
-            # Parse each line
-            current_section = "General"
-            for line in lines:
-                # Skip comments or section headers
-                if line.startswith(';'):
-                    if "=====" in line:
-                        current_section = line.replace(';', '').replace('=', '').strip()
-                    continue
-
-                # Parse key-value pairs
-                if '=' in line:
-                    key, value = line.split('=', 1)  # Split only on the first '='
-                    key = key.strip()
-                    value = value.split('||')[0].strip()  # Extract value before "||"
-                    parameters[key] = {
-                        "section": current_section,
-                        "value": value,
-                        "raw_line": line
-                    }
+            # Typed parameter table, see src/ml/set_file.py
+            parameters = parse_set_file(file_path)
 
             return {
                 "file_name": os.path.basename(file_path),
                 "file_type": "SET File",
-                "parameters": parameters,
-                "line_count": len(lines),
+                "parameters": parameters.to_dict(),
+                "line_count": parameters.line_count,
                 "parameter_count": len(parameters),
             }
         except Exception as e:
@@ -0,0 +1,98 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from indicators import (
+    price_changes, rolling_mean, rsi_from_averages, true_range, wilder_smooth
+)
+
+FeatureSpec = namedtuple('FeatureSpec', ['name', 'period'])
+FeatureSpec.__new__.__defaults__ = (None,)
+
+PERIODIC_FEATURES = ['RSI', 'SMA', 'ATR']
+PLAIN_FEATURES = ['Price_Range', 'Price_Change']
+
+# The columns of TitanDataProcessor.create_features as specs
+DEFAULT_SPECS = [
+    FeatureSpec('RSI', 14),
+    FeatureSpec('SMA', 20),
+    FeatureSpec('SMA', 50),
+    FeatureSpec('ATR', 14),
+    FeatureSpec('Price_Range'),
+    FeatureSpec('Price_Change')
+]
+
+
+def expand_specs(name, periods):
+    """One spec per period, e.g. expand_specs('RSI', range(5, 50, 5))"""
+    return [FeatureSpec(name, int(period)) for period in periods]
+
+
+def spec_column(spec):
+    return spec.name if spec.period is None else f"{spec.name}_{spec.period}"
+
+
+class BatchFeatureBuilder:
+    """Computes many indicator/period variants for many symbols in one pass each
+
+    Intermediates every variant of an indicator shares are built once per
+    symbol: the cumulative close sum for all SMA periods, the gain/loss
+    series for all RSI periods and the true range for all ATR periods; each
+    extra period then only costs one cumsum difference or one closed-form
+    Wilder smoothing. Output is a (bars, specs) matrix in spec order
+    (column-major, so that every feature is written contiguously), float32
+    for wide grids by default; the training and live features use float64.
+    """
+
+    def __init__(self, specs=None, dtype=np.float32):
+        specs = list(specs or DEFAULT_SPECS)
+        for spec in specs:
+            if spec.name in PERIODIC_FEATURES and not spec.period:
+                raise ValueError(f"{spec.name} needs a period")
+            if spec.name not in PERIODIC_FEATURES + PLAIN_FEATURES:
+                raise ValueError(f"Unknown feature '{spec.name}'")
+        # Duplicates are computed once
+        self.specs = list(dict.fromkeys(specs))
+        self.columns = [spec_column(spec) for spec in self.specs]
+        self.dtype = dtype
+
+    def transform(self, data):
+        """Feature matrix for one OHLC frame"""
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        close = data['Close'].to_numpy(dtype=np.float64)
+        names = {spec.name for spec in self.specs}
+
+        shared = {}
+        if 'SMA' in names:
+            # Summing close - close[0] keeps the running total small and precise
+            shared['cumulative'] = np.concatenate([[0.0], np.cumsum(close - close[0])])
+        if 'RSI' in names:
+            shared['gains'], shared['losses'] = price_changes(close)
+        if 'ATR' in names:
+            shared['true_range'] = true_range(high, low, close)
+
+        columns = np.empty((len(self.specs), len(close)), dtype=self.dtype)
+        for i, spec in enumerate(self.specs):
+            if spec.name == 'SMA':
+                columns[i] = rolling_mean(shared['cumulative'], spec.period, close[0])
+            elif spec.name == 'RSI':
+                columns[i] = rsi_from_averages(
+                    wilder_smooth(shared['gains'], spec.period),
+                    wilder_smooth(shared['losses'], spec.period)
+                )
+            elif spec.name == 'ATR':
+                columns[i] = wilder_smooth(shared['true_range'], spec.period)
+            elif spec.name == 'Price_Range':
+                columns[i] = high - low
+            elif spec.name == 'Price_Change':
+                columns[i, 0] = np.nan
+                columns[i, 1:] = close[1:] / close[:-1] - 1
+        return columns.T
+
+    def transform_many(self, frames, max_workers=None):
+        """{symbol: frame} -> {symbol: feature matrix}; symbols run in threads when max_workers > 1"""
+        if not max_workers or max_workers == 1:
+            return {symbol: self.transform(frame) for symbol, frame in frames.items()}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {symbol: executor.submit(self.transform, frame) for symbol, frame in frames.items()}
+            return {symbol: future.result() for symbol, future in futures.items()}
@@ -0,0 +1,62 @@
+"""Latency benchmark: FastForestPredictor vs RandomForestClassifier.predict
+
+Trains the default TitanMLModel forest on a month of USDJPY M1 features
+from the local archive, checks that both predictors return identical
+classes for every row, then times the single-bar path (TitanMLModel.predict
+on a one-row frame vs predict_row) and the batched path.
+
+    python bench_fast_predictor.py [data_dir]
+"""
+import sys
+import time
+import numpy as np
+from history_loader import load_history
+from data_processor import TitanDataProcessor
+from model import TitanMLModel
+from fast_predictor import FastForestPredictor
+
+
+def best_of(func, repeat=5, number=1):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def main(data_dir='../../data'):
+    data = load_history('USDJPY', '2023-01-01', '2023-01-31', data_dir=data_dir)
+    processor = TitanDataProcessor()
+    X = processor.prepare_training_data(processor.create_features(data))
+    y = (X['Close'].shift(-1) > X['Close']).astype(int)[:-1]
+    X = X[:-1]
+
+    model = TitanMLModel()
+    model.train(X, y)
+    fast = FastForestPredictor(model.model)
+    features = X[model.feature_columns].to_numpy(dtype=np.float32)
+
+    expected = model.predict(X)
+    batched = fast.predict(features)
+    single = np.array([fast.predict_row(row) for row in features[:2000]])
+    print(f"{len(X)} rows, {fast.n_trees} trees, max depth {fast.max_depth}")
+    print(f"Batched predictions identical: {np.array_equal(expected, batched)}")
+    print(f"Single-row predictions identical: {np.array_equal(expected[:2000], single)}")
+
+    one_row = X.iloc[[-1]]
+    sklearn_row = best_of(lambda: model.predict(one_row), number=20)
+    fast.row[:] = features[-1]
+    fast_row = best_of(lambda: fast.predict_row(), number=2000)
+    print(f"Single bar:  sklearn {sklearn_row * 1e6:9.1f} us   fast {fast_row * 1e6:7.1f} us   "
+          f"({sklearn_row / fast_row:.0f}x)")
+
+    sklearn_batch = best_of(lambda: model.predict(X), repeat=3)
+    fast_batch = best_of(lambda: fast.predict(features), repeat=3)
+    print(f"Batch:       sklearn {sklearn_batch * 1e3:9.1f} ms   fast {fast_batch * 1e3:7.1f} ms   "
+          f"({sklearn_batch / fast_batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,86 @@
+"""Import-time budget check for the entry points (python -X importtime)
+
+Each target is imported in a fresh interpreter with -X importtime. The
+report lists its total import time, the heaviest top-level imports, and
+any deferred dependency (sklearn, talib, MetaTrader5, chardet) that was
+imported anyway. The exit status is 1 if a target is over its budget or
+pulled in a deferred module. Targets whose own dependencies are missing
+(PyQt5 for the GUI) are skipped. The mt5_env streaming modules are imported
+with only mt5_env on the path, as test_mt5.py and test_realtime.py run them.
+
+    python bench_import_time.py [budget_scale]
+"""
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ML_DIR = os.path.join(ROOT, 'src', 'ml')
+MT5_DIR = os.path.join(ROOT, 'mt5_env')
+
+# Modules that must only be imported when first used
+DEFERRED = ['sklearn', 'talib', 'MetaTrader5', 'chardet']
+
+# name, python arguments, budget in ms (pandas alone is ~450 ms here), PYTHONPATH (the first is the cwd)
+TARGETS = [
+    ('cli --help', ['-c', 'import sys; sys.argv = ["cli.py", "--help"]; import cli; cli.build_parser()'], 100,
+     [ROOT, ML_DIR, MT5_DIR]),
+    ('data_processor', ['-c', 'import data_processor'], 900, [ROOT, ML_DIR, MT5_DIR]),
+    ('model', ['-c', 'import model'], 900, [ROOT, ML_DIR, MT5_DIR]),
+    ('trainer', ['-c', 'import trainer'], 900, [ROOT, ML_DIR, MT5_DIR]),
+    ('realtime_pipeline', ['-c', 'import realtime_pipeline'], 1000, [MT5_DIR]),
+    ('mt5_connector', ['-c', 'import mt5_connector'], 700, [MT5_DIR]),
+    ('mt5_realtime', ['-c', 'import mt5_realtime, data_streamer, python_realtime'], 700, [MT5_DIR]),
+    # Everything main_window imports besides Qt, which the first window needs anyway
+    ('gui file handling', ['-c', 'import src.core.file_handler, src.core.ea_parser'], 100, [ROOT]),
+    ('main_window', ['-c', 'import src.ui.main_window'], 1000, [ROOT]),
+]
+
+
+def import_times(args, paths):
+    """({top-level module: cumulative us}, {second-level module: cumulative us}, imported names, error)"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(paths))
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=paths[0], env=env,
+                             capture_output=True, text=True)
+    if process.returncode != 0:
+        return None, None, None, process.stderr.strip().splitlines()[-1]
+
+    top_level, children, names = {}, {}, set()
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        names.add(name.strip().split('.')[0])
+        # Nested imports are indented two spaces per level below their importer
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        if depth == 0:
+            top_level[name.strip()] = int(cumulative)
+        elif depth == 1:
+            children[name.strip()] = int(cumulative)
+    return top_level, children, names, None
+
+
+def main(budget_scale=1.0):
+    failed = False
+    for name, args, budget, paths in TARGETS:
+        top_level, children, names, error = import_times(args, paths)
+        if error is not None:
+            print(f"{name:18s} skipped: {error}")
+            continue
+
+        total = sum(top_level.values()) / 1000
+        limit = budget * float(budget_scale)
+        eager = [module for module in DEFERRED if module in names]
+        status = 'ok' if total <= limit and not eager else 'FAIL'
+        failed |= status == 'FAIL'
+
+        heaviest = sorted(children.items(), key=lambda item: -item[1])[:3]
+        print(f"{name:18s} {total:7.0f} ms (budget {limit:.0f})  {status}")
+        print(f"{'':18s} heaviest: " + ', '.join(f"{module} {us / 1000:.0f} ms" for module, us in heaviest))
+        if eager:
+            print(f"{'':18s} imported eagerly: {', '.join(eager)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,107 @@
+"""Peak-memory benchmark: MT5 rates -> OHLCV frame
+
+Compares the old get_historical_data path (frame -> to_dict('records') ->
+DataFrame -> astype(float)) with mt5_rates_to_frame on the structured array.
+Each variant runs in a fresh process on ~90 days of synthetic M1 rates;
+peak RSS growth (Unix) and peak traced allocations are reported.
+
+    python bench_mt5_preprocess.py [days]
+"""
+import sys
+import time
+import tracemalloc
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+from data_processor import mt5_rates_to_frame
+
+MT5_RATES_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')
+])
+
+
+def make_rates(days):
+    """Synthetic M1 rates in the layout copy_rates_range returns"""
+    rng = np.random.default_rng(42)
+    rows = days * 1440
+    rates = np.zeros(rows, dtype=MT5_RATES_DTYPE)
+    rates['time'] = 1700000000 + np.arange(rows) * 60
+    close = 150 + np.cumsum(rng.normal(0, 0.01, rows))
+    rates['open'] = close + rng.normal(0, 0.002, rows)
+    rates['high'] = np.maximum(rates['open'], close) + rng.random(rows) * 0.01
+    rates['low'] = np.minimum(rates['open'], close) - rng.random(rows) * 0.01
+    rates['close'] = close
+    rates['tick_volume'] = rng.integers(1, 300, rows)
+    rates['spread'] = rng.integers(0, 20, rows)
+    return rates
+
+
+def legacy_path(rates):
+    df = pd.DataFrame(rates)
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    df.set_index('time', inplace=True)
+    records = df.reset_index().to_dict('records')
+
+    df = pd.DataFrame(records)
+    df['DateTime'] = pd.to_datetime(df['time'])
+    df.set_index('DateTime', inplace=True)
+    df = df.rename(columns={
+        'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'tick_volume': 'Volume'
+    })
+    df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+    return df.astype(float)
+
+
+def columnar_path(rates):
+    return mt5_rates_to_frame(rates)
+
+
+def _peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _run(name, days, results):
+    rates = make_rates(days)
+    rss_before = _peak_rss_bytes()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = legacy_path(rates) if name == 'legacy' else columnar_path(rates)
+    elapsed = time.perf_counter() - start
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rss_after = _peak_rss_bytes()
+    results[name] = {
+        'rows': len(df),
+        'seconds': elapsed,
+        'traced_peak_mb': traced_peak / 2**20,
+        'rss_growth_mb': None if rss_before is None else (rss_after - rss_before) / 2**20
+    }
+
+
+def main(days=90):
+    manager = mp.Manager()
+    results = manager.dict()
+    for name in ['legacy', 'columnar']:
+        process = mp.Process(target=_run, args=(name, days, results))
+        process.start()
+        process.join()
+
+    print(f"{days} days of M1 rates ({days * 1440} rows)")
+    for name in ['legacy', 'columnar']:
+        r = results[name]
+        rss = 'n/a' if r['rss_growth_mb'] is None else f"{r['rss_growth_mb']:.1f} MB"
+        print(f"{name:>9}: {r['seconds']:.3f}s, traced peak {r['traced_peak_mb']:.1f} MB, "
+              f"peak RSS growth {rss}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 90)
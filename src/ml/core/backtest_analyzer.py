@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+TRADE_COLUMNS = [
+    'entry_time', 'exit_time', 'direction', 'entry_price', 'exit_price',
+    'exit_reason', 'points', 'profit'
+]
+
+
+def infer_point(prices, max_digits=6):
+    """Smallest price step that every quote is a multiple of (0.001 for 3-digit USDJPY)"""
+    sample = np.asarray(prices, dtype=np.float64)[:10000]
+    for digits in range(max_digits + 1):
+        scaled = sample * 10 ** digits
+        if np.all(np.abs(scaled - np.round(scaled)) < 1e-6):
+            return 10.0 ** -digits
+    return 10.0 ** -max_digits
+
+
+class TitanBacktestAnalyzer:
+    """Vectorized bar-level backtest of a signal array with TP/SL exits
+
+    A signal on bar i (> 0 buy, < 0 sell) opens a trade at the open of bar
+    i + 1, one position at a time. The first bar whose range reaches the take
+    profit or stop loss closes it (the stop wins when both fall in the same
+    bar, a gap through the stop fills at the open); trades still open after
+    max_bars are closed at that bar's close.
+
+    Exits are found for every candidate entry at once by binary lifting over
+    sparse tables of rolling high maxima / low minima, so the tables are built
+    once per price series and reused by every run() of a parameter search.
+    """
+
+    def __init__(self, data, point=None, point_value=1.0, max_bars=10080):
+        self.index = data.index
+        self.open = data['Open'].to_numpy(dtype=np.float64)
+        self.high = data['High'].to_numpy(dtype=np.float64)
+        self.low = data['Low'].to_numpy(dtype=np.float64)
+        self.close = data['Close'].to_numpy(dtype=np.float64)
+        self.point = point if point is not None else infer_point(self.close)
+        self.point_value = point_value
+        self.max_bars = max_bars
+        self.max_tables, self.min_tables = self._build_tables()
+
+    def _build_tables(self):
+        """tables[p][k] = max/min over bars [k, k + 2**p), +-inf where that runs past the end"""
+        n = len(self.high)
+        max_tables = [self.high]
+        min_tables = [self.low]
+        span = 1
+        while span * 2 <= self.max_bars:
+            prev_max, prev_min = max_tables[-1], min_tables[-1]
+            next_max = np.full(n, np.inf)
+            next_min = np.full(n, -np.inf)
+            valid = n - span
+            if valid > 0:
+                np.maximum(prev_max[:valid], prev_max[span:], out=next_max[:valid])
+                np.minimum(prev_min[:valid], prev_min[span:], out=next_min[:valid])
+            max_tables.append(next_max)
+            min_tables.append(next_min)
+            span *= 2
+        return max_tables, min_tables
+
+    def _first_touch(self, start, upper, lower):
+        """First bar at or after start whose high >= upper or low <= lower"""
+        n = len(self.high)
+        pos = start.copy()
+        for p in range(len(self.max_tables) - 1, -1, -1):
+            span = 1 << p
+            inside = pos < n
+            at = np.minimum(pos, n - 1)
+            clear = (
+                inside
+                & (pos + span - start <= self.max_bars)
+                & (self.max_tables[p][at] < upper)
+                & (self.min_tables[p][at] > lower)
+            )
+            pos = np.where(clear, pos + span, pos)
+        return pos
+
+    def _select_trades(self, entries, exits):
+        """Walk the candidates keeping one open position at a time"""
+        following = np.searchsorted(entries, exits, side='right')
+        taken = []
+        candidate = 0
+        while candidate < len(entries):
+            taken.append(candidate)
+            candidate = following[candidate]
+        return np.array(taken, dtype=np.int64)
+
+    def run(self, signals, take_profit, stop_loss, lots=0.01, max_spread=None, spread=0):
+        """Backtest signals with TP/SL in points; spread (points, scalar or per bar) is charged per trade"""
+        try:
+            signals = np.asarray(signals)
+            if len(signals) != len(self.close):
+                raise ValueError(f"Expected {len(self.close)} signals, got {len(signals)}")
+            spread = np.broadcast_to(np.asarray(spread, dtype=np.float64), self.close.shape)
+
+            signal_bars = np.flatnonzero(signals[:-1] != 0)
+            entries = signal_bars + 1
+            if max_spread is not None:
+                allowed = spread[entries] <= max_spread
+                signal_bars, entries = signal_bars[allowed], entries[allowed]
+            direction = np.where(signals[signal_bars] > 0, 1, -1)
+
+            entry_price = self.open[entries]
+            tp_price = entry_price + direction * take_profit * self.point
+            sl_price = entry_price - direction * stop_loss * self.point
+            upper = np.where(direction > 0, tp_price, sl_price)
+            lower = np.where(direction > 0, sl_price, tp_price)
+
+            n = len(self.close)
+            touch = self._first_touch(entries, upper, lower)
+            timed_out = (touch >= n) | (touch - entries >= self.max_bars)
+            exits = np.where(timed_out, np.minimum(entries + self.max_bars, n) - 1, touch)
+
+            taken = self._select_trades(entries, exits)
+            return self._summarize(
+                entries[taken], exits[taken], direction[taken], entry_price[taken],
+                tp_price[taken], sl_price[taken], timed_out[taken], spread, lots
+            )
+
+        except Exception as e:
+            print(f"Error running backtest: {str(e)}")
+            return None
+
+    def _summarize(self, entries, exits, direction, entry_price, tp_price, sl_price, timed_out, spread, lots):
+        high, low, bar_open = self.high[exits], self.low[exits], self.open[exits]
+        long = direction > 0
+        sl_hit = ~timed_out & np.where(long, low <= sl_price, high >= sl_price)
+
+        # Gaps past the stop fill at the open; entry bars open at the entry price
+        gap_fill = np.where(long, np.minimum(bar_open, sl_price), np.maximum(bar_open, sl_price))
+        exit_price = np.where(timed_out, self.close[exits], np.where(sl_hit, gap_fill, tp_price))
+
+        points = direction * (exit_price - entry_price) / self.point - spread[entries]
+        profit = points * self.point_value * lots
+        equity = np.cumsum(profit)
+        drawdown = np.maximum.accumulate(np.append(0.0, equity))[1:] - equity
+
+        gross_profit = profit[profit > 0].sum()
+        gross_loss = abs(profit[profit < 0].sum())
+        if gross_loss > 0:
+            profit_factor = gross_profit / gross_loss
+        else:
+            profit_factor = float('inf') if gross_profit > 0 else 0.0
+        trades = pd.DataFrame({
+            'entry_time': self.index[entries],
+            'exit_time': self.index[exits],
+            'direction': direction,
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'exit_reason': np.where(timed_out, 'time', np.where(sl_hit, 'sl', 'tp')),
+            'points': points,
+            'profit': profit
+        }, columns=TRADE_COLUMNS)
+
+        return {
+            'net_profit': float(equity[-1]) if len(equity) else 0.0,
+            'gross_profit': float(gross_profit),
+            'gross_loss': float(gross_loss),
+            'profit_factor': float(profit_factor),
+            'max_drawdown': float(drawdown.max()) if len(drawdown) else 0.0,
+            'trade_count': len(trades),
+            'win_rate': float((profit > 0).mean()) if len(profit) else 0.0,
+            'equity': equity,
+            'trades': trades
+        }
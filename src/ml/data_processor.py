@@ -1,12 +1,62 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-import talib
+from feature_scaler import FeatureScaler
+from streaming_features import FEATURE_COLUMNS, StreamingFeatureEngine
+from batch_features import DEFAULT_SPECS, BatchFeatureBuilder, spec_column
+from feature_engineering import FEATURE_DTYPE, FeatureStore
+
+# MT5 rate fields and the pipeline column each one becomes
+MT5_COLUMNS = {
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'tick_volume': 'Volume'
+}
+
+
+def mt5_rates_to_frame(rates):
+    """Build the float OHLCV frame indexed by DateTime from MT5 rates
+    
+    Accepts the structured array returned by copy_rates_*, a DataFrame (with a
+    'time' column or a time index) or a list of row dicts. Columns are taken as
+    whole arrays, never row by row; price fields are float64 already and are
+    used without copying.
+    """
+    if isinstance(rates, list):
+        rates = pd.DataFrame(rates)
+    
+    if isinstance(rates, pd.DataFrame):
+        if 'time' in rates.columns:
+            times = rates['time'].to_numpy()
+        else:
+            times = rates.index.to_numpy()
+        columns = {name: rates[name].to_numpy() for name in MT5_COLUMNS}
+    else:
+        times = rates['time']
+        columns = {name: rates[name] for name in MT5_COLUMNS}
+    
+    if np.issubdtype(times.dtype, np.integer) or np.issubdtype(times.dtype, np.floating):
+        times = times.astype('datetime64[s]')
+    index = pd.DatetimeIndex(times, name='DateTime')
+    
+    data = {
+        MT5_COLUMNS[name]: values.astype(np.float64, copy=False)
+        for name, values in columns.items()
+    }
+    return pd.DataFrame(data, index=index, copy=False)
+
 
 class TitanDataProcessor:
     def __init__(self):
-        self.scaler = StandardScaler()
+        self.feature_columns = list(FEATURE_COLUMNS)
+        self.scaler = FeatureScaler(self.feature_columns)
         self.required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+        self.feature_engine = None
+        # The feature store's kernels and dtype, so live rows are computed exactly like training rows
+        self.feature_builder = BatchFeatureBuilder(DEFAULT_SPECS, dtype=FEATURE_DTYPE)
+        # Newest live bar already folded into the scaler statistics
+        self.scaler_updated_to = None
     
     def process_mt5_data(self, mt5_data):
         """Process real-time MT5 data"""
@@ -37,35 +87,92 @@ class TitanDataProcessor:
             raise
     
     def create_features(self, data):
-        """Generate technical indicators and features"""
+        """Generate technical indicators (RSI, MA20, MA50, ATR) and price features
+        
+        Uses the NumPy kernels of the feature store in float64, so a live window
+        gets the same values as create_features_cached() gave the training bars.
+        """
+        df = data.copy()
+        df[FEATURE_COLUMNS] = self.feature_builder.transform(df)
+        return df
+    
+    def create_features_cached(self, data, symbol, timeframe='M1', store=None, source=None):
+        """create_features() backed by the feature store: only bars newer than the store are computed"""
+        store = store or FeatureStore()
+        features = store.features(symbol, timeframe, data, DEFAULT_SPECS, source)
+        features = features.rename(columns=dict(zip(map(spec_column, DEFAULT_SPECS), FEATURE_COLUMNS)))
         df = data.copy()
+        df[FEATURE_COLUMNS] = features[FEATURE_COLUMNS]
+        return df
+    
+    def create_feature_grid(self, frames, specs, max_workers=None):
+        """Many indicator/period variants for {symbol: frame} as float32 matrices"""
+        builder = BatchFeatureBuilder(specs)
+        return builder.columns, builder.transform_many(frames, max_workers)
+    
+    def start_streaming(self, data):
+        """Seed the incremental feature engine from historical bars"""
+        self.feature_engine = StreamingFeatureEngine()
+        return self.feature_engine.seed(data)
+    
+    def process_bar(self, high, low, close):
+        """Generate the feature row for one newly closed bar in constant time"""
+        if self.feature_engine is None:
+            raise RuntimeError("Call start_streaming() with historical data first")
+        return self.feature_engine.update(high, low, close)
+    
+    def prepare_training_data(self, data, fit=True):
+        """Prepare data for model training (fit=True) or inference (fit=False)
         
-        # Add technical indicators
-        df['RSI'] = talib.RSI(df['Close'])
-        df['MA20'] = talib.SMA(df['Close'], timeperiod=20)
-        df['MA50'] = talib.SMA(df['Close'], timeperiod=50)
-        df['ATR'] = talib.ATR(df['High'], df['Low'], df['Close'])
+        Inference only applies the scaler; update_scaler() is what folds new
+        bars into it.
+        """
+        # dropna already returns a new frame, no extra copy needed
+        df = data.dropna()
         
-        # Add custom features
-        df['Price_Range'] = df['High'] - df['Low']
-        df['Price_Change'] = df['Close'].pct_change()
+        # Scale features in place on a single float64 block
+        values = df[self.feature_columns].to_numpy(dtype=np.float64, copy=True)
+        if fit:
+            self.scaler.fit(values)
+        self.scaler.transform(values)
+        df.loc[:, self.feature_columns] = values
         
         return df
     
-    def prepare_training_data(self, data):
-        """Prepare data for model training"""
-        # Create explicit copy and remove NaN values
-        df = data.copy()
-        df = df.dropna()
+    def save_scaler(self, path):
+        """Persist the fitted scaler statistics"""
+        self.scaler.save(path)
+    
+    def load_scaler(self, path):
+        """Load scaler statistics saved by save_scaler()"""
+        self.scaler = FeatureScaler.load(path)
+        self.scaler_updated_to = None
+    
+    def update_scaler(self, featured_df):
+        """Fold the bars of a live window that are newer than the last update into the scaler
         
-        # Scale features using loc
-        features = ['RSI', 'MA20', 'MA50', 'ATR', 'Price_Range', 'Price_Change']
-        df.loc[:, features] = self.scaler.fit_transform(df[features])
+        The first window only marks its newest bar: those bars are part of the
+        history the scaler was fitted on. After that each call adds just the
+        bars that closed since, so the rolling window is never counted twice.
+        """
+        df = featured_df.dropna()
+        if df.empty:
+            return 0
+        if self.scaler_updated_to is None:
+            self.scaler_updated_to = df.index[-1]
+            return 0
         
-        return df
+        new_rows = df[df.index > self.scaler_updated_to]
+        if not new_rows.empty:
+            self.scaler.partial_fit(new_rows[self.feature_columns].to_numpy(dtype=np.float64))
+            self.scaler_updated_to = new_rows.index[-1]
+        return len(new_rows)
     
-    def process_realtime_data(self, mt5_data):
+    def process_realtime_data(self, mt5_data, update_scaler=False):
         """Process real-time data through the complete pipeline"""
+        if not self.scaler.is_fitted:
+            raise RuntimeError("No fitted scaler: train a model or call load_scaler() before processing live data")
+        
         try:
             # Process MT5 data
             processed_df = self.process_mt5_data(mt5_data)
@@ -73,8 +180,10 @@ class TitanDataProcessor:
             # Generate features
             featured_df = self.create_features(processed_df)
             
-            # Prepare for model
-            prepared_df = self.prepare_training_data(featured_df)
+            # Scale with the training statistics, optionally extended by the bars closed since
+            if update_scaler:
+                self.update_scaler(featured_df)
+            prepared_df = self.prepare_training_data(featured_df, fit=False)
             
             return prepared_df
             
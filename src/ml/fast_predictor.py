@@ -0,0 +1,156 @@
+import os
+import json
+import numpy as np
+
+# Node count and depth of a saved predictor, next to its .npy node arrays
+SHAPE_FILE = 'shape.json'
+
+
+class FastForestPredictor:
+    """Flattened random forest for low-overhead inference
+
+    All trees of a fitted RandomForestClassifier are packed into contiguous
+    node arrays (feature, threshold, children, leaf probabilities); leaves
+    point back to themselves, so every tree is advanced in lock-step for
+    exactly max_depth steps with a handful of vectorized numpy operations
+    and no per-call validation. Votes are summed tree by tree and divided
+    by the tree count exactly as sklearn does, so the predicted classes
+    are identical to RandomForestClassifier.predict on float32 inputs.
+
+    save() writes the flattened arrays as .npy files and load() memory-maps
+    them back, so a warm start reads no tree until it is walked.
+    """
+
+    # Flattened arrays written by save() and memory-mapped by load()
+    ARRAYS = ('roots', 'feature', 'threshold', 'children', 'values', 'classes')
+
+    def __init__(self, forest):
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        self.estimators = forest.estimators_
+        self.trees = trees
+        self.classes = np.asarray(forest.classes_)
+        self.n_features = forest.n_features_in_
+        self.max_depth = max(tree.max_depth for tree in trees)
+
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.roots = offsets[:-1].astype(np.intp)
+        self.offsets = self.roots
+
+        features, thresholds, children, values = [], [], [], []
+        for offset, tree in zip(offsets, trees):
+            nodes = np.arange(tree.node_count) + offset
+            leaf = tree.children_left == -1
+            left = np.where(leaf, nodes, tree.children_left + offset)
+            right = np.where(leaf, nodes, tree.children_right + offset)
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            children.append(np.stack([left, right], axis=1))
+
+            # Per-leaf class probabilities, normalized the way DecisionTreeClassifier does
+            value = tree.value[:, 0, :len(self.classes)].astype(np.float64)
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+
+        self.feature = np.ascontiguousarray(np.concatenate(features), dtype=np.intp)
+        self.threshold = np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64)
+        self.children = np.ascontiguousarray(np.concatenate(children).ravel(), dtype=np.intp)
+        self.values = np.ascontiguousarray(np.concatenate(values))
+        self._init_buffers()
+
+    def _init_buffers(self):
+        self.n_trees = len(self.roots)
+        # Preallocated single-row buffers
+        self.row = np.zeros(self.n_features, dtype=np.float32)
+        self._nodes = np.empty(self.n_trees, dtype=np.intp)
+        self._right = np.empty(self.n_trees, dtype=bool)
+
+    def save(self, directory):
+        """Write the flattened arrays as .npy files into directory"""
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, SHAPE_FILE), 'w') as f:
+            json.dump({'n_features': int(self.n_features), 'max_depth': int(self.max_depth)}, f)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r', estimators=None):
+        """Predictor over the arrays save() wrote, memory-mapped unless mmap_mode is None
+
+        estimators is the fitted forest's estimators_ list the arrays came
+        from, if it is loaded too; without the trees predict_proba walks the
+        flattened arrays for every row.
+        """
+        predictor = cls.__new__(cls)
+        for name in cls.ARRAYS:
+            setattr(predictor, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode))
+        with open(os.path.join(directory, SHAPE_FILE), 'r') as f:
+            shape = json.load(f)
+        predictor.n_features = shape['n_features']
+        predictor.max_depth = shape['max_depth']
+        predictor.estimators = estimators
+        predictor.trees = None
+        predictor.offsets = predictor.roots
+        predictor._init_buffers()
+        return predictor
+
+    def _leaves_row(self, row):
+        nodes = self._nodes
+        nodes[:] = self.roots
+        for _ in range(self.max_depth):
+            np.greater(row[self.feature[nodes]], self.threshold[nodes], out=self._right)
+            nodes *= 2
+            nodes += self._right
+            nodes[:] = self.children[nodes]
+        return nodes
+
+    def _leaves(self, X):
+        """(rows, trees) leaf indices of every row, all trees walked in lock-step"""
+        nodes = np.repeat(self.roots[np.newaxis, :], len(X), axis=0)
+        right = np.empty(nodes.shape, dtype=bool)
+        rows = np.arange(len(X))[:, np.newaxis]
+        for _ in range(self.max_depth):
+            np.greater(X[rows, self.feature[nodes]], self.threshold[nodes], out=right)
+            nodes *= 2
+            nodes += right
+            nodes[:] = self.children[nodes]
+        return nodes
+
+    def predict_proba_row(self, values=None):
+        """Class probabilities for one feature vector (defaults to the preallocated self.row)"""
+        row = self.row
+        if values is not None:
+            row[:] = values
+        # Sequential sum over trees, then one division, as in sklearn
+        proba = np.add.reduce(self.values[self._leaves_row(row)], axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict_row(self, values=None):
+        """Predicted class for one feature vector"""
+        return self.classes[np.argmax(self.predict_proba_row(values))]
+
+    def predict_proba(self, X):
+        """Class probabilities for a (rows, features) array
+
+        Many rows amortize the call overhead, so here each tree is walked by
+        its compiled apply() and only the leaf lookup and vote sum are done
+        on the flattened arrays. A predictor loaded without its trees walks
+        the flattened arrays instead.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        proba = np.zeros((len(X), len(self.classes)))
+        votes = np.empty_like(proba)
+        if self.trees is None:
+            tree_leaves = self._leaves(X).T
+        else:
+            tree_leaves = (tree.apply(X) + offset for tree, offset in zip(self.trees, self.offsets))
+        for leaves in tree_leaves:
+            np.take(self.values, leaves, axis=0, out=votes)
+            proba += votes
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        """Predicted classes for a (rows, features) array"""
+        return self.classes[np.argmax(self.predict_proba(X), axis=1)]
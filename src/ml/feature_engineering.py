@@ -0,0 +1,185 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from batch_features import BatchFeatureBuilder
+
+# Wilder smoothing never forgets, but after 50 periods the seed weighs (1 - 1/p)**(50p) < 1e-21
+WILDER_WARMUP_PERIODS = 50
+
+META_FILE = 'meta.json'
+TIME_FILE = 'time.bin'
+FEATURES_FILE = 'features.bin'
+
+# Stored features have the dtype TitanDataProcessor.create_features computes live
+FEATURE_DTYPE = np.float64
+
+# Prices that identify a bar when checking stored rows against new data
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+def specs_hash(specs, source=None):
+    """Stable key for a list of feature specs computed from one data source"""
+    payload = json.dumps([[[spec.name, spec.period] for spec in specs], source, np.dtype(FEATURE_DTYPE).str])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def bar_hash(data, position):
+    """Digest of the time and OHLC prices of data's bar at position"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(np.int64(data.index[position].value).tobytes())
+    for column in BAR_COLUMNS:
+        digest.update(np.float64(data[column].iloc[position]).tobytes())
+    return digest.hexdigest()
+
+
+def warmup_bars(specs):
+    """Bars of history needed before the first new row so its features match a full recompute"""
+    lookback = 0
+    for spec in specs:
+        if spec.name in ('RSI', 'ATR'):
+            lookback = max(lookback, WILDER_WARMUP_PERIODS * spec.period + 1)
+        elif spec.name == 'SMA':
+            lookback = max(lookback, spec.period - 1)
+        elif spec.name == 'Price_Change':
+            lookback = max(lookback, 1)
+    return lookback
+
+
+class FeatureStore:
+    """Append-only on-disk feature columns per (symbol, timeframe, data source, feature specs)
+
+    Each series is a raw int64 file of bar times, a raw float64 row-major
+    feature file and a meta.json whose row count is the commit point, so a
+    crash in the middle of an append is rolled back on the next open.
+    update() only computes the rows newer than the stored tail, on a window
+    that starts warmup_bars() earlier; load() memory-maps the files.
+
+    source names where the bars come from (e.g. 'mt5' for terminal downloads)
+    so feeds with different prices never share a series. meta.json also
+    keeps a hash of the first and last stored bar; data whose bars at those
+    times differ (a revised history) rebuilds the series instead of being
+    appended to features computed from other prices.
+    """
+
+    def __init__(self, root='feature_store'):
+        self.root = root
+
+    def series_dir(self, symbol, timeframe, specs, source=None):
+        return os.path.join(self.root, symbol, str(timeframe), specs_hash(specs, source))
+
+    def _stored_bars_match(self, meta, data, times):
+        """Whether data's bars at the stored first/last times have the stored prices"""
+        for time_key, hash_key in (('first_time', 'first_hash'), ('last_time', 'last_hash')):
+            position = int(np.searchsorted(times, meta[time_key]))
+            if position < len(times) and times[position] == meta[time_key]:
+                if bar_hash(data, position) != meta[hash_key]:
+                    return False
+        return True
+
+    def _read_meta(self, directory):
+        path = os.path.join(directory, META_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _write_meta(self, directory, meta):
+        path = os.path.join(directory, META_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def _truncate(self, directory, rows, width):
+        """Drop anything written after the last committed row"""
+        for name, row_bytes in ((TIME_FILE, 8), (FEATURES_FILE, np.dtype(FEATURE_DTYPE).itemsize * width)):
+            path = os.path.join(directory, name)
+            if os.path.exists(path) and os.path.getsize(path) != rows * row_bytes:
+                with open(path, 'r+b') as f:
+                    f.truncate(rows * row_bytes)
+
+    def update(self, symbol, timeframe, data, specs, source=None):
+        """Extend the stored features with the bars of data newer than the stored tail"""
+        specs = list(specs)
+        builder = BatchFeatureBuilder(specs, dtype=FEATURE_DTYPE)
+        directory = self.series_dir(symbol, timeframe, specs, source)
+        os.makedirs(directory, exist_ok=True)
+
+        times = data.index.values.astype('datetime64[s]').astype(np.int64)
+        meta = self._read_meta(directory)
+        if meta is not None and len(times) and meta['rows']:
+            if times[0] < meta['first_time']:
+                # Older bars than the stored head: the series cannot be extended, rebuild it
+                print(f"Rebuilding features for {symbol} {timeframe}: data starts before the store")
+                meta = None
+            elif not self._stored_bars_match(meta, data, times):
+                print(f"Rebuilding features for {symbol} {timeframe}: data differs from the stored bars")
+                meta = None
+        if meta is None:
+            meta = {
+                'symbol': symbol,
+                'timeframe': str(timeframe),
+                'source': source,
+                'specs': [[spec.name, spec.period] for spec in builder.specs],
+                'columns': builder.columns,
+                'dtype': np.dtype(FEATURE_DTYPE).str,
+                'rows': 0,
+                'first_time': None,
+                'last_time': None,
+                'first_hash': None,
+                'last_hash': None
+            }
+            for name in (TIME_FILE, FEATURES_FILE):
+                open(os.path.join(directory, name), 'wb').close()
+        self._truncate(directory, meta['rows'], len(builder.columns))
+
+        first_new = 0 if meta['last_time'] is None else int(np.searchsorted(times, meta['last_time'], side='right'))
+        if first_new >= len(times):
+            return 0
+
+        lookback = warmup_bars(builder.specs)
+        if meta['rows'] and first_new < lookback:
+            print(f"Warning: only {first_new} of {lookback} warm-up bars before the new {symbol} data")
+        start = max(0, first_new - lookback)
+        features = builder.transform(data.iloc[start:])[first_new - start:]
+
+        with open(os.path.join(directory, FEATURES_FILE), 'ab') as f:
+            f.write(np.ascontiguousarray(features, dtype=FEATURE_DTYPE).tobytes())
+        with open(os.path.join(directory, TIME_FILE), 'ab') as f:
+            f.write(times[first_new:].tobytes())
+
+        if meta['first_time'] is None:
+            meta['first_time'] = int(times[0])
+            meta['first_hash'] = bar_hash(data, 0)
+        meta['rows'] += len(features)
+        meta['last_time'] = int(times[-1])
+        meta['last_hash'] = bar_hash(data, len(times) - 1)
+        self._write_meta(directory, meta)
+
+        print(f"Stored {len(features)} new feature rows for {symbol} {timeframe}")
+        return len(features)
+
+    def load(self, symbol, timeframe, specs, start=None, end=None, source=None):
+        """Stored features as a float64 DataFrame over memory-mapped files (None if empty)"""
+        directory = self.series_dir(symbol, timeframe, list(specs), source)
+        meta = self._read_meta(directory)
+        if meta is None or meta['rows'] == 0:
+            return None
+
+        rows, width = meta['rows'], len(meta['columns'])
+        times = np.memmap(os.path.join(directory, TIME_FILE), dtype=np.int64, mode='r', shape=(rows,))
+        features = np.memmap(os.path.join(directory, FEATURES_FILE), dtype=FEATURE_DTYPE, mode='r',
+                             shape=(rows, width))
+
+        lo = 0 if start is None else int(np.searchsorted(times, pd.Timestamp(start).value // 10 ** 9))
+        hi = rows if end is None else int(np.searchsorted(times, pd.Timestamp(end).value // 10 ** 9, side='right'))
+        index = pd.DatetimeIndex(times[lo:hi].astype('datetime64[s]'), name='DateTime')
+        return pd.DataFrame(features[lo:hi], index=index, columns=meta['columns'], copy=False)
+
+    def features(self, symbol, timeframe, data, specs, source=None):
+        """Bring the store up to date with data and return the features on data's bars"""
+        self.update(symbol, timeframe, data, specs, source)
+        stored = self.load(symbol, timeframe, specs, data.index[0], data.index[-1], source)
+        return stored.reindex(data.index)
+
@@ -0,0 +1,93 @@
+import numpy as np
+
+
+class FeatureScaler:
+    """Standardizes feature columns with frozen mean/scale vectors
+
+    fit() learns the statistics once (same definition as sklearn's
+    StandardScaler: population variance, zero variance scaled by 1).
+    transform() applies them in place on a float64 array; partial_fit()
+    folds new rows into the statistics with Welford/Chan updates.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = list(columns) if columns is not None else None
+        self.n_samples_ = 0
+        self.mean_ = None
+        self.m2_ = None
+        self.scale_ = None
+
+    @property
+    def is_fitted(self):
+        return self.mean_ is not None
+
+    def fit(self, values):
+        """Learn mean and scale from a (rows, features) array"""
+        values = np.asarray(values, dtype=np.float64)
+        self.n_samples_ = values.shape[0]
+        self.mean_ = values.mean(axis=0)
+        self.m2_ = ((values - self.mean_) ** 2).sum(axis=0)
+        self._update_scale()
+        return self
+
+    def partial_fit(self, values):
+        """Fold new rows into the running statistics (Chan's parallel Welford merge)"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        if not self.is_fitted:
+            return self.fit(values)
+
+        n_new = values.shape[0]
+        if n_new == 0:
+            return self
+        new_mean = values.mean(axis=0)
+        new_m2 = ((values - new_mean) ** 2).sum(axis=0)
+
+        total = self.n_samples_ + n_new
+        delta = new_mean - self.mean_
+        self.mean_ = self.mean_ + delta * (n_new / total)
+        self.m2_ = self.m2_ + new_m2 + delta ** 2 * (self.n_samples_ * n_new / total)
+        self.n_samples_ = total
+        self._update_scale()
+        return self
+
+    def _update_scale(self):
+        scale = np.sqrt(self.m2_ / self.n_samples_)
+        scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+        self.scale_ = scale
+
+    def transform(self, values):
+        """Standardize a float64 (rows, features) array in place and return it"""
+        if not self.is_fitted:
+            raise RuntimeError("FeatureScaler is not fitted, call fit() or load() first")
+        values -= self.mean_
+        values /= self.scale_
+        return values
+
+    def to_dict(self):
+        """Statistics as plain numpy arrays for persistence"""
+        return {
+            'columns': np.array(self.columns or [], dtype=str),
+            'n_samples': np.array(self.n_samples_),
+            'mean': self.mean_,
+            'm2': self.m2_
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        scaler = cls(list(state['columns']) or None)
+        scaler.n_samples_ = int(state['n_samples'])
+        scaler.mean_ = np.asarray(state['mean'], dtype=np.float64)
+        scaler.m2_ = np.asarray(state['m2'], dtype=np.float64)
+        scaler._update_scale()
+        return scaler
+
+    def save(self, path):
+        """Persist the statistics to an .npz file"""
+        np.savez(path, **self.to_dict())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as state:
+            return cls.from_dict(state)
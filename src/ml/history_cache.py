@@ -0,0 +1,138 @@
+import os
+import json
+import numpy as np
+from history_loader import MONTHLY_FILE_PATTERN, columns_to_frame, parse_monthly_file
+
+# Arrays of a cached month: epoch-minute timestamps, (rows, 4) OHLC prices and volume
+CACHE_COLUMNS = {
+    'time': np.int64,
+    'prices': np.float64,
+    'Volume': np.float32
+}
+# Bumped when the array layout changes; months cached in another layout are re-ingested
+CACHE_FORMAT = 2
+
+MANIFEST_NAME = 'manifest.json'
+
+
+class HistoryCache:
+    """Columnar binary cache of the monthly CSV archive under data/"""
+
+    def __init__(self, data_dir='data', cache_dir=None):
+        self.data_dir = data_dir
+        self.cache_dir = cache_dir or os.path.join(data_dir, 'cache')
+        self.manifest_path = os.path.join(self.cache_dir, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, 'r') as f:
+            return json.load(f)
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def source_files(self):
+        """List the monthly source files in the data directory"""
+        names = []
+        for name in sorted(os.listdir(self.data_dir)):
+            path = os.path.join(self.data_dir, name)
+            if MONTHLY_FILE_PATTERN.match(name) and os.path.isfile(path):
+                names.append(name)
+        return names
+
+    def month_key(self, file_name):
+        """Cache key for a source file (the name without extension)"""
+        return os.path.splitext(file_name)[0]
+
+    def is_fresh(self, file_name):
+        """Check the cached month against the source file's mtime and size"""
+        entry = self.manifest.get(self.month_key(file_name))
+        if entry is None or entry.get('format') != CACHE_FORMAT:
+            return False
+        stat = os.stat(os.path.join(self.data_dir, file_name))
+        return entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size
+
+    def ingest(self, force=False):
+        """Convert every new or changed monthly file into the binary cache"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        converted = []
+
+        for file_name in self.source_files():
+            if not force and self.is_fresh(file_name):
+                continue
+
+            source_path = os.path.join(self.data_dir, file_name)
+            stat = os.stat(source_path)
+            columns = parse_monthly_file(source_path)
+
+            key = self.month_key(file_name)
+            month_dir = os.path.join(self.cache_dir, key)
+            os.makedirs(month_dir, exist_ok=True)
+            for name, values in columns.items():
+                np.save(os.path.join(month_dir, f"{name}.npy"), values)
+
+            self.manifest[key] = {
+                'source': file_name,
+                'format': CACHE_FORMAT,
+                'mtime': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'rows': len(columns['time']),
+                'first': int(columns['time'][0]),
+                'last': int(columns['time'][-1])
+            }
+            # Persist after every month so an interrupted ingest keeps its progress
+            self._save_manifest()
+            converted.append(file_name)
+            print(f"Cached {file_name}: {len(columns['time'])} rows")
+
+        return converted
+
+    def load_month(self, key):
+        """Memory-map one cached month as a DataFrame without copying
+
+        The frame's OHLC block and Volume column are the read-only memmaps.
+        """
+        return columns_to_frame(self.load_columns([key]))
+
+    def keys(self, symbol=None):
+        """Cached month keys, oldest first, optionally only those of one symbol"""
+        keys = []
+        for key in self.manifest:
+            match = MONTHLY_FILE_PATTERN.match(key)
+            if match is None or (symbol is not None and match.group('symbol') != symbol):
+                continue
+            keys.append((match.group('year'), match.group('month'), key))
+        return [key for _, _, key in sorted(keys)]
+
+    def load_columns(self, keys):
+        """Column arrays of the given months; one month stays memory-mapped"""
+        if len(keys) == 1:
+            month_dir = os.path.join(self.cache_dir, keys[0])
+            return {
+                name: np.load(os.path.join(month_dir, f"{name}.npy"), mmap_mode='r')
+                for name in CACHE_COLUMNS
+            }
+
+        # Several months: one contiguous copy per array, no per-row objects
+        arrays = {}
+        for name in CACHE_COLUMNS:
+            parts = [
+                np.load(os.path.join(self.cache_dir, key, f"{name}.npy"), mmap_mode='r')
+                for key in keys
+            ]
+            arrays[name] = np.concatenate(parts)
+        return arrays
+
+    def load(self, keys=None, symbol=None):
+        """Load cached months (all of symbol's, or all by default) as one DataFrame indexed by DateTime"""
+        if keys is None:
+            keys = self.keys(symbol)
+        if not keys:
+            target = f" for {symbol}" if symbol is not None else ''
+            raise ValueError(f"No cached history{target} in {self.cache_dir}, run ingest() first")
+        return columns_to_frame(self.load_columns(keys))
@@ -0,0 +1,173 @@
+import os
+import re
+import datetime
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+# Monthly exports are named Standard_<SYMBOL>_<YYYY>_<MM>, optionally with .csv
+MONTHLY_FILE_PATTERN = re.compile(r'^Standard_(?P<symbol>[A-Za-z0-9]+)_(?P<year>\d{4})_(?P<month>\d{2})(\.csv)?$')
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+# The float64 prices are kept as one (rows, 4) array so a frame can wrap it as a single block
+PRICE_BLOCK = ['Open', 'High', 'Low', 'Close']
+
+
+def _digits(values, width):
+    """View fixed-width ASCII strings as a (rows, width) array of digit values"""
+    raw = np.asarray(values, dtype=f'S{width}')
+    return raw.view(np.uint8).reshape(-1, width).astype(np.int64) - ord('0')
+
+
+def parse_timestamps(dates, times):
+    """Vectorized parse of 'YYYY.MM.DD' and 'HH:MM' columns into epoch minutes"""
+    d = _digits(dates, 10)
+    t = _digits(times, 5)
+
+    year = d[:, 0] * 1000 + d[:, 1] * 100 + d[:, 2] * 10 + d[:, 3]
+    month = d[:, 5] * 10 + d[:, 6]
+    day = d[:, 8] * 10 + d[:, 9]
+    hour = t[:, 0] * 10 + t[:, 1]
+    minute = t[:, 3] * 10 + t[:, 4]
+
+    # Let numpy's calendar arithmetic turn year/month into days since epoch
+    months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    days = months.astype('datetime64[D]').astype(np.int64) + day - 1
+    return days * 1440 + hour * 60 + minute
+
+
+def parse_monthly_file(path):
+    """Parse one monthly M1 export (date,time,open,high,low,close,volume) into column arrays
+
+    Returns 'time' (epoch minutes), 'prices' (rows, 4) in PRICE_BLOCK order
+    and 'Volume'.
+    """
+    df = pd.read_csv(path, header=None, names=['Date', 'Time'] + PRICE_COLUMNS, dtype={
+        'Date': str, 'Time': str,
+        'Open': np.float64, 'High': np.float64, 'Low': np.float64, 'Close': np.float64,
+        'Volume': np.float32
+    })
+
+    return {
+        'time': parse_timestamps(df['Date'].to_numpy(), df['Time'].to_numpy()),
+        'prices': np.ascontiguousarray(df[PRICE_BLOCK].to_numpy()),
+        'Volume': df['Volume'].to_numpy()
+    }
+
+
+def to_epoch_minutes(timestamp):
+    """Convert anything pd.Timestamp accepts into integer minutes since the epoch"""
+    return np.datetime64(pd.Timestamp(timestamp), 'm').astype(np.int64)
+
+
+def end_bound(end):
+    """Exclusive upper bound of a range ending at end
+
+    A date without a time (a string without ':' or a datetime.date) ends
+    after its last minute, so '2023-03-31' keeps all of March 31; any other
+    end keeps the minute it falls in.
+    """
+    timestamp = pd.Timestamp(end)
+    if isinstance(end, str):
+        date_only = ':' not in end
+    else:
+        date_only = isinstance(end, datetime.date) and not isinstance(end, datetime.datetime)
+    if date_only:
+        return timestamp.normalize() + pd.Timedelta(days=1)
+    return timestamp.floor('min') + pd.Timedelta(minutes=1)
+
+
+def find_monthly_files(symbol, start=None, end=None, data_dir='data'):
+    """List the monthly files for a symbol that overlap [start, end], oldest first (see end_bound)"""
+    start = pd.Timestamp(start) if start is not None else None
+    end = end_bound(end) if end is not None else None
+
+    matches = []
+    for name in os.listdir(data_dir):
+        match = MONTHLY_FILE_PATTERN.match(name)
+        if match is None or match.group('symbol') != symbol:
+            continue
+
+        month_start = pd.Timestamp(int(match.group('year')), int(match.group('month')), 1)
+        month_end = month_start + pd.offsets.MonthBegin(1)
+        if start is not None and month_end <= start:
+            continue
+        if end is not None and month_start >= end:
+            continue
+        matches.append((month_start, os.path.join(data_dir, name)))
+
+    return [path for _, path in sorted(matches)]
+
+
+def recent_start(symbol, months, end=None, data_dir='data'):
+    """First day of the last `months` monthly files of a symbol up to end, None if there are none"""
+    paths = find_monthly_files(symbol, None, end, data_dir)[-months:]
+    if not paths:
+        return None
+    match = MONTHLY_FILE_PATTERN.match(os.path.basename(paths[0]))
+    return pd.Timestamp(int(match.group('year')), int(match.group('month')), 1)
+
+
+def columns_to_frame(columns):
+    """Build an OHLCV DataFrame indexed by DateTime from parsed column arrays
+
+    The prices array becomes the frame's float64 block and Volume its
+    float32 block as they are, so a memory-mapped month is not copied.
+    """
+    index = pd.DatetimeIndex(
+        np.asarray(columns['time']).astype('datetime64[m]').astype('datetime64[s]'),
+        name='DateTime'
+    )
+    # One frame per dtype joined by concat keeps both arrays; assigning a column would copy it
+    prices = pd.DataFrame(columns['prices'], index=index, columns=PRICE_BLOCK, copy=False)
+    volume = pd.DataFrame({'Volume': columns['Volume']}, index=index, copy=False)
+    return pd.concat([prices, volume], axis=1)
+
+
+def slice_columns(columns, start=None, end=None):
+    """Restrict parsed columns to the rows inside [start, end] (see end_bound) using the sorted timestamps"""
+    times = columns['time']
+    lo = 0
+    hi = len(times)
+    if start is not None:
+        lo = np.searchsorted(times, to_epoch_minutes(start), side='left')
+    if end is not None:
+        hi = np.searchsorted(times, to_epoch_minutes(end_bound(end)), side='left')
+    return {name: values[lo:hi] for name, values in columns.items()}
+
+
+def load_history(symbol, start=None, end=None, data_dir='data', max_workers=None, use_cache=True):
+    """Load M1 history for a symbol, reading only the monthly files that overlap [start, end]
+
+    A date-only end includes that whole day (see end_bound).
+
+    When every one of those months is up to date in the binary cache under
+    data_dir/cache (see HistoryCache.ingest), the cached arrays are read
+    instead of parsing the CSV files.
+    """
+    paths = find_monthly_files(symbol, start, end, data_dir)
+    if not paths:
+        raise ValueError(f"No history files for {symbol} between {start} and {end} in {data_dir}")
+
+    if use_cache:
+        # history_cache imports this module
+        from history_cache import HistoryCache
+
+        cache = HistoryCache(data_dir)
+        file_names = [os.path.basename(path) for path in paths]
+        if cache.manifest and all(cache.is_fresh(name) for name in file_names):
+            columns = cache.load_columns([cache.month_key(name) for name in file_names])
+            return columns_to_frame(slice_columns(columns, start, end))
+
+    if len(paths) == 1 or max_workers == 1:
+        parts = [parse_monthly_file(path) for path in paths]
+    else:
+        workers = min(len(paths), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(parse_monthly_file, paths))
+
+    columns = {
+        name: np.concatenate([part[name] for part in parts])
+        for name in parts[0]
+    }
+    return columns_to_frame(slice_columns(columns, start, end))
@@ -0,0 +1,156 @@
+import math
+from functools import lru_cache
+import numpy as np
+
+# Largest block of the closed-form Wilder recurrence; a**-block must stay far from overflow
+WILDER_BLOCK = 1024
+
+# RSI treats a gain/loss sum with |x| < 1e-8 as zero, like TA-Lib
+RSI_EPSILON = 0.00000001
+
+
+@lru_cache(maxsize=None)
+def recurrence_powers(a):
+    """a**1 .. a**B for the blocks of linear_recurrence with decay 0 < a, B <= WILDER_BLOCK
+
+    Cached and shared with the streaming indicators, which must multiply by
+    the very same values; do not modify the returned array.
+    """
+    block = min(WILDER_BLOCK, int(600 / -math.log(a))) if a < 1 else WILDER_BLOCK
+    return a ** np.arange(1, max(1, block) + 1)
+
+
+def linear_recurrence(x, a, b, y0, out=None):
+    """y[k] = a * y[k-1] + b * x[k] for all k, starting from y0, without a per-element loop
+
+    Inside a block of B values the recurrence has the closed form
+    y[k] = a**k * (y0 + b * sum(x[j] * a**-j, j <= k)), i.e. one cumsum; only
+    the block-start values are carried from block to block in Python.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    m = len(x)
+    if out is None:
+        out = np.empty(m)
+    if m == 0:
+        return out
+    if a == 0:
+        np.multiply(x, b, out=out)
+        return out
+
+    powers = recurrence_powers(a)
+    block = min(m, len(powers))
+    n_blocks = -(-m // block)
+    powers = powers[:block]
+
+    scaled = np.zeros((n_blocks, block))
+    scaled.reshape(-1)[:m] = x
+    scaled *= b / powers
+    np.cumsum(scaled, axis=1, out=scaled)
+
+    # y0 of each block, from the previous block's end value
+    ends = scaled[:, -1] * powers[-1]
+    carries = np.empty(n_blocks)
+    carry = y0
+    decay = powers[-1]
+    for i in range(n_blocks):
+        carries[i] = carry
+        carry = decay * carry + ends[i]
+
+    scaled += carries[:, None]
+    scaled *= powers
+    out[:] = scaled.reshape(-1)[:m]
+    return out
+
+
+def wilder_smooth(values, period, start=1):
+    """Wilder moving average as TA-Lib seeds it: the first output is the plain mean of
+    values[start:start + period], later ones are (prev * (period - 1) + value) / period"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    first = start + period - 1
+    if first >= len(values):
+        return out
+    out[first] = values[start:first + 1].sum() / period
+    linear_recurrence(values[first + 1:], (period - 1) / period, 1 / period, out[first], out=out[first + 1:])
+    return out
+
+
+def rolling_mean(cumulative, period, offset=0.0):
+    """Moving average from a zero-prefixed cumulative sum (NaN for the first period - 1 bars)"""
+    out = np.full(len(cumulative) - 1, np.nan)
+    out[period - 1:] = (cumulative[period:] - cumulative[:-period]) / period + offset
+    return out
+
+
+def price_changes(close):
+    """Gains and losses of close against the previous bar (the first bar has neither)"""
+    change = np.empty(len(close))
+    change[0] = np.nan
+    np.subtract(close[1:], close[:-1], out=change[1:])
+    gains = np.where(change > 0, change, 0.0)
+    losses = np.where(change < 0, -change, 0.0)
+    return gains, losses
+
+
+def true_range(high, low, close):
+    """TA-Lib true range (the first bar has none)"""
+    prev_close = np.empty(len(close))
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    return np.maximum(high - low, np.maximum(np.abs(prev_close - high), np.abs(low - prev_close)))
+
+
+def rsi_from_averages(avg_gain, avg_loss, epsilon=RSI_EPSILON):
+    """RSI from Wilder-smoothed gains and losses, 0 where their sum is ~0
+
+    This is TA-Lib 0.4 (the wheel shipped in mt5_env); the 0.6+ C library
+    repeats the previous value there instead, which only differs on long
+    stretches of unchanged closes.
+    """
+    total = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 * (avg_gain / total)
+    rsi[np.abs(total) < epsilon] = 0.0
+    return rsi
+
+
+# TA-Lib compatible functions: same names, arguments and NaN lead-in as talib's
+# function API, so `talib = indicators` works where TA-Lib is not installed.
+
+def _values(series):
+    return np.asarray(series, dtype=np.float64)
+
+
+def _like(series, values):
+    """Return values as a Series on series' index when the input was one, as talib does"""
+    index = getattr(series, 'index', None)
+    if index is None:
+        return values
+    return type(series)(values, index=index)
+
+
+def SMA(close, timeperiod=30):
+    """Simple moving average"""
+    values = _values(close)
+    if len(values) == 0:
+        return _like(close, np.empty(0))
+    # Summing close - close[0] keeps the running total small and precise
+    cumulative = np.concatenate([[0.0], np.cumsum(values - values[0])])
+    return _like(close, rolling_mean(cumulative, timeperiod, values[0]))
+
+
+def RSI(close, timeperiod=14):
+    """Wilder RSI, the first value at bar timeperiod"""
+    values = _values(close)
+    if len(values) == 0:
+        return _like(close, np.empty(0))
+    gains, losses = price_changes(values)
+    return _like(close, rsi_from_averages(wilder_smooth(gains, timeperiod), wilder_smooth(losses, timeperiod)))
+
+
+def ATR(high, low, close, timeperiod=14):
+    """Wilder average true range, the first value at bar timeperiod"""
+    values = _values(close)
+    if len(values) == 0:
+        return _like(close, np.empty(0))
+    return _like(close, wilder_smooth(true_range(_values(high), _values(low), values), timeperiod))
@@ -0,0 +1,44 @@
+import importlib
+
+
+class LazyModule:
+    """Stand-in for a heavy module that imports it on first attribute access
+
+    ensemble = lazy_import('sklearn.ensemble') costs nothing at module load;
+    the first ensemble.RandomForestClassifier(...) imports the real module,
+    after which attribute lookups go straight to it. A missing package only
+    fails at that first use, with the install hint in the error.
+    """
+
+    __slots__ = ('_name', '_hint', '_module')
+
+    def __init__(self, name, hint=None):
+        self._name = name
+        self._hint = hint
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError as e:
+                if self._hint is None:
+                    raise
+                raise ImportError(f"{e} ({self._hint})") from e
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    @property
+    def is_loaded(self):
+        return self._module is not None
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name, hint=None):
+    """LazyModule for name; hint is appended to the ImportError if it is missing"""
+    return LazyModule(name, hint)
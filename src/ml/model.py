@@ -1,33 +1,96 @@
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, precision_score, recall_score
+from lazy_imports import lazy_import
+from validation import cross_validate, purged_kfold_splits, walk_forward_splits
+from fast_predictor import FastForestPredictor
+
+# sklearn takes seconds to import, it is loaded when the first model is built or trained
+ensemble = lazy_import('sklearn.ensemble')
+model_selection = lazy_import('sklearn.model_selection')
+metrics = lazy_import('sklearn.metrics')
 
 class TitanMLModel:
     def __init__(self):
-        self.model = RandomForestClassifier(
+        self.model_params = dict(
             n_estimators=100,
             max_depth=10,
             random_state=42
-        )  # Added closing parenthesis
+        )
+        self._model = None
         self.feature_columns = ['RSI', 'MA20', 'MA50', 'ATR', 'Price_Range', 'Price_Change']
+        self.fast_predictor = None
+    
+    @property
+    def model(self):
+        """The RandomForestClassifier, created on first use"""
+        if self._model is None:
+            self._model = ensemble.RandomForestClassifier(**self.model_params)
+        return self._model
     
-    def train(self, X, y):
-        """Train the model"""
-        X_train, X_test, y_train, y_test = train_test_split(
+    @model.setter
+    def model(self, estimator):
+        self._model = estimator
+    
+    def train(self, X, y, validation='holdout', n_splits=5, n_jobs=1, purge=1):
+        """Train the model
+
+        validation='walk_forward' or 'purged_kfold' scores time-ordered folds
+        (fit in parallel with n_jobs) instead of a shuffled holdout, then
+        fits the final model on all rows.
+        """
+        if validation != 'holdout':
+            return self.cross_validate(X, y, validation, n_splits, n_jobs, purge)
+        
+        X_train, X_test, y_train, y_test = model_selection.train_test_split(
             X[self.feature_columns], y, test_size=0.2, random_state=42
         )  # Added closing parenthesis
         self.model.fit(X_train, y_train)
         return self.evaluate(X_test, y_test)
     
+    def cross_validate(self, X, y, validation='walk_forward', n_splits=5, n_jobs=1, purge=1):
+        """Time-series cross-validation over one feature matrix, folds are row slices"""
+        features = X[self.feature_columns].to_numpy()
+        target = y.to_numpy() if hasattr(y, 'to_numpy') else y
+        
+        if validation == 'walk_forward':
+            splits = walk_forward_splits(len(features), n_splits, gap=purge)
+        elif validation == 'purged_kfold':
+            splits = purged_kfold_splits(len(features), n_splits, purge=purge)
+        else:
+            raise ValueError(f"Unknown validation mode '{validation}'")
+        
+        folds = cross_validate(self.model, features, target, splits, n_jobs=n_jobs)
+        self.model.fit(X[self.feature_columns], target)
+        
+        return {
+            'accuracy': sum(fold['accuracy'] for fold in folds) / len(folds),
+            'precision': sum(fold['precision'] for fold in folds) / len(folds),
+            'recall': sum(fold['recall'] for fold in folds) / len(folds),
+            'folds': folds
+        }
+    
     def predict(self, X):
         """Make predictions"""
         return self.model.predict(X[self.feature_columns])
     
+    def bar_predictor(self):
+        """FastForestPredictor of the fitted estimator, flattened once per fit"""
+        # Rebuild the flattened forest whenever the estimator was refit or reloaded
+        if self.fast_predictor is None or self.fast_predictor.estimators is not self.model.estimators_:
+            self.fast_predictor = FastForestPredictor(self.model)
+        return self.fast_predictor
+    
+    def predict_bar(self, features):
+        """Predict one bar from a feature vector ordered like feature_columns"""
+        return self.bar_predictor().predict_row(features)
+    
+    def predict_proba_bar(self, features):
+        """Class probabilities of one bar from a feature vector ordered like feature_columns"""
+        return self.bar_predictor().predict_proba_row(features)
+    
     def evaluate(self, X_test, y_test):
         """Evaluate model performance"""
         predictions = self.predict(X_test)
         return {
-            'accuracy': accuracy_score(y_test, predictions),
-            'precision': precision_score(y_test, predictions, average='weighted'),
-            'recall': recall_score(y_test, predictions, average='weighted')
+            'accuracy': metrics.accuracy_score(y_test, predictions),
+            'precision': metrics.precision_score(y_test, predictions, average='weighted'),
+            'recall': metrics.recall_score(y_test, predictions, average='weighted')
         }
@@ -0,0 +1,158 @@
+import os
+import json
+import shutil
+import hashlib
+from datetime import datetime, timezone
+import numpy as np
+from feature_scaler import FeatureScaler
+from fast_predictor import FastForestPredictor
+from lazy_imports import lazy_import
+
+joblib = lazy_import('joblib')
+
+MODEL_FILE = 'model.joblib'
+SCALER_FILE = 'scaler.npz'
+FOREST_DIR = 'forest'
+META_FILE = 'meta.json'
+LATEST_FILE = 'latest.json'
+
+
+def data_hash(data, columns=('Open', 'High', 'Low', 'Close', 'Volume')):
+    """Content hash of the bars a model was trained on (index plus OHLCV values)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(data.index.values.astype('datetime64[s]')).tobytes())
+    for column in columns:
+        if column in data:
+            digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def cutoff_version(data):
+    """Registry key of a model trained on bars up to data's last bar, e.g. '20231229T2359'"""
+    return f"{data.index[-1]:%Y%m%dT%H%M}"
+
+
+class ModelRegistry:
+    """Fitted models on disk, keyed by symbol, timeframe and a version
+
+    The version is the data_hash of the training bars for a fixed archive
+    (the same bars always reuse the same fit), or the cutoff_version of a
+    rolling live window, whose hash changes with every new bar. Each entry
+    holds the estimator (joblib), the FastForestPredictor arrays of its
+    trees as .npy files, which load() memory-maps for the per-bar path, the
+    scaler statistics and the feature columns.
+    A latest.json per symbol/timeframe points at the newest entry, which is
+    what the live path warm-starts from (see load_recent).
+    """
+
+    def __init__(self, root='models'):
+        self.root = root
+
+    def series_dir(self, symbol, timeframe):
+        return os.path.join(self.root, symbol, str(timeframe))
+
+    def entry_dir(self, symbol, timeframe, data_hash):
+        return os.path.join(self.series_dir(symbol, timeframe), data_hash)
+
+    def latest_hash(self, symbol, timeframe):
+        path = os.path.join(self.series_dir(symbol, timeframe), LATEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)['data_hash']
+
+    def latest_meta(self, symbol, timeframe):
+        """Metadata of the latest entry without loading the estimator, or None"""
+        data_hash = self.latest_hash(symbol, timeframe)
+        if data_hash is None or not self.has(symbol, timeframe, data_hash):
+            return None
+        with open(os.path.join(self.entry_dir(symbol, timeframe, data_hash), META_FILE), 'r') as f:
+            return json.load(f)
+
+    def has(self, symbol, timeframe, data_hash):
+        return os.path.exists(os.path.join(self.entry_dir(symbol, timeframe, data_hash), META_FILE))
+
+    def save(self, symbol, timeframe, data_hash, model, processor=None, metrics=None):
+        """Store a fitted TitanMLModel (and the processor's scaler) and mark it latest"""
+        entry = self.entry_dir(symbol, timeframe, data_hash)
+        tmp_entry = entry + '.tmp'
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        os.makedirs(tmp_entry)
+
+        joblib.dump(model.model, os.path.join(tmp_entry, MODEL_FILE))
+        model.bar_predictor().save(os.path.join(tmp_entry, FOREST_DIR))
+        if processor is not None and processor.scaler.is_fitted:
+            processor.scaler.save(os.path.join(tmp_entry, SCALER_FILE))
+
+        meta = {
+            'symbol': symbol,
+            'timeframe': str(timeframe),
+            'data_hash': data_hash,
+            'feature_columns': list(model.feature_columns),
+            'params': {key: value for key, value in model.model.get_params().items()
+                       if isinstance(value, (int, float, str, bool, type(None)))},
+            'metrics': {key: float(value) for key, value in (metrics or {}).items()
+                        if isinstance(value, (int, float, np.floating))},
+            'created': datetime.now(timezone.utc).isoformat()
+        }
+        with open(os.path.join(tmp_entry, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        # Swap the finished entry in, so a crash never leaves a half-written model
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_entry, entry)
+
+        latest_path = os.path.join(self.series_dir(symbol, timeframe), LATEST_FILE)
+        with open(latest_path + '.tmp', 'w') as f:
+            json.dump({'data_hash': data_hash}, f)
+        os.replace(latest_path + '.tmp', latest_path)
+
+        print(f"Saved model for {symbol} {timeframe} ({data_hash})")
+        return entry
+
+    def load(self, symbol, timeframe, data_hash=None, model=None, processor=None, mmap_mode='r'):
+        """Restore an entry into model (and processor) and return its metadata, or None
+
+        Without data_hash the latest entry of the symbol/timeframe is used.
+        The model's per-bar predictor is opened over the entry's flattened
+        tree arrays with np.load(mmap_mode=mmap_mode) instead of rebuilt.
+        """
+        data_hash = data_hash or self.latest_hash(symbol, timeframe)
+        if data_hash is None or not self.has(symbol, timeframe, data_hash):
+            return None
+
+        entry = self.entry_dir(symbol, timeframe, data_hash)
+        try:
+            with open(os.path.join(entry, META_FILE), 'r') as f:
+                meta = json.load(f)
+
+            estimator = joblib.load(os.path.join(entry, MODEL_FILE))
+            if model is not None:
+                model.model = estimator
+                model.feature_columns = meta['feature_columns']
+                forest_dir = os.path.join(entry, FOREST_DIR)
+                if os.path.isdir(forest_dir):
+                    model.fast_predictor = FastForestPredictor.load(forest_dir, mmap_mode, estimator.estimators_)
+            meta['estimator'] = estimator
+
+            scaler_path = os.path.join(entry, SCALER_FILE)
+            if processor is not None and os.path.exists(scaler_path):
+                processor.scaler = FeatureScaler.load(scaler_path)
+
+            print(f"Loaded model for {symbol} {timeframe} ({data_hash})")
+            return meta
+
+        except Exception as e:
+            print(f"Error loading model: {str(e)}")
+            return None
+
+    def load_recent(self, symbol, timeframe, max_age, model=None, processor=None, mmap_mode='r'):
+        """load() the latest entry if it was trained less than max_age (a timedelta) ago, else None"""
+        meta = self.latest_meta(symbol, timeframe)
+        if meta is None:
+            return None
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(meta['created'])
+        if age > max_age:
+            print(f"Latest model for {symbol} {timeframe} is {age} old, retraining")
+            return None
+        return self.load(symbol, timeframe, meta['data_hash'], model, processor, mmap_mode)
@@ -2,20 +2,36 @@ from data_streamer import DataStreamer
 from set_handler import SetFileHandler
 from model import TitanMLModel
 from data_processor import TitanDataProcessor
+from model_registry import ModelRegistry
+from lazy_imports import lazy_import
 
+mt5 = lazy_import('MetaTrader5', "pip install MetaTrader5 (Windows only)")
 
-def optimize_trading_parameters():
+
+def optimize_trading_parameters(symbol="USDJPY", timeframe='M1', set_file_path="path/to/your/strategy.set"):
     # Initialize components
-    streamer = DataStreamer()
-    set_handler = SetFileHandler("path/to/your/strategy.set")
+    streamer = DataStreamer(symbol)
+    set_handler = SetFileHandler(set_file_path)
+    model = TitanMLModel()
+    processor = TitanDataProcessor()
     
     try:
+        # Warm start from the last trained model and its scaler, no retraining
+        if ModelRegistry().load(symbol, timeframe, model=model, processor=processor) is None:
+            raise Exception(f"No trained model for {symbol} {timeframe}, run the training pipeline first")
+        
         streamer.initialize()
         
         # Stream data continuously
         for data in streamer.stream_data():
             # Process data through ML pipeline
-            predictions = model.predict(data)
+            features = processor.process_realtime_data(data)
+            if features is None or features.empty:
+                continue
+            
+            # Probability of an up move on the latest closed bar
+            probabilities = model.predict_proba_bar(features[model.feature_columns].to_numpy()[-1])
+            predictions = {'trend_strength': probabilities[-1]}
             
             # Update SET file parameters based on predictions
             set_handler.update_parameters(predictions)
@@ -23,4 +39,4 @@ def optimize_trading_parameters():
     except Exception as e:
         print(f"Optimization error: {str(e)}")
     finally:
-        mt5.shutdown()
\ No newline at end of file
+        mt5.shutdown()
\ No newline at end of file
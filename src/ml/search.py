@@ -0,0 +1,324 @@
+import math
+import time
+import itertools
+import numpy as np
+
+
+def is_range(values):
+    """A (low, high) tuple is a numeric range, anything else a list of choices"""
+    return isinstance(values, tuple) and len(values) == 2
+
+
+def sample_params(space, rng):
+    """Draw one point of the search space uniformly"""
+    params = {}
+    for name, values in space.items():
+        if is_range(values):
+            low, high = values
+            if isinstance(low, int) and isinstance(high, int):
+                params[name] = int(rng.integers(low, high + 1))
+            else:
+                params[name] = float(rng.uniform(low, high))
+        else:
+            params[name] = values[rng.integers(len(values))]
+    return params
+
+
+def grid_params(space, grid_points=5):
+    """Every combination of the choices (ranges are cut into grid_points values)"""
+    axes = []
+    for values in space.values():
+        if is_range(values):
+            low, high = values
+            points = np.linspace(low, high, grid_points)
+            if isinstance(low, int) and isinstance(high, int):
+                values = sorted({int(round(p)) for p in points})
+            else:
+                values = [float(p) for p in points]
+        axes.append(list(values))
+    return [dict(zip(space, combination)) for combination in itertools.product(*axes)]
+
+
+def params_key(params):
+    return tuple(sorted(params.items()))
+
+
+class BaseSearch:
+    """Budgeted hyperparameter search over a dict space (score: higher is better)
+
+    space maps each parameter to a list of choices or a (low, high) range.
+    The objective is called as objective(params, resource), where resource
+    in (0, 1] is the fraction of the training budget to spend (data rows,
+    history length...); with batch=True it receives a list of (params,
+    resource) pairs and returns a list of scores, so a caller can fan a
+    whole rung out to a process pool.
+
+    The search stops on max_seconds, on max_fits objective calls, or after
+    patience full-resource fits without a new best.
+    """
+
+    def __init__(self, space, max_seconds=None, max_fits=None, patience=None, seed=42, verbose=True):
+        self.space = space
+        self.max_seconds = max_seconds
+        self.max_fits = max_fits
+        self.patience = patience
+        self.seed = seed
+        self.verbose = verbose
+
+    def run(self, objective, batch=False):
+        self.objective = objective
+        self.batch = batch
+        self.rng = np.random.default_rng(self.seed)
+        self.history = []
+        self.cache = {}
+        self.fits = 0
+        self.resource_used = 0.0
+        self.best_params = None
+        self.best_score = -np.inf
+        self.since_best = 0
+        self.started = time.perf_counter()
+
+        self._search()
+
+        return {
+            'best_params': self.best_params,
+            'best_score': self.best_score,
+            'fits': self.fits,
+            'resource': self.resource_used,
+            'seconds': time.perf_counter() - self.started,
+            'history': self.history
+        }
+
+    @property
+    def stopped(self):
+        if self.max_fits is not None and self.fits >= self.max_fits:
+            return True
+        if self.max_seconds is not None and time.perf_counter() - self.started >= self.max_seconds:
+            return True
+        return self.patience is not None and self.since_best >= self.patience
+
+    def evaluate(self, candidates, resource=1.0):
+        """Scores for the candidates at one resource level (-inf when the budget ran out)"""
+        pending = []
+        for params in candidates:
+            key = (params_key(params), resource)
+            if key not in self.cache and all(key != (params_key(p), resource) for p in pending):
+                pending.append(params)
+
+        if not self.stopped and pending:
+            if self.max_fits is not None:
+                pending = pending[:self.max_fits - self.fits]
+            if self.batch:
+                scores = self.objective([(params, resource) for params in pending])
+            else:
+                scores = []
+                for params in pending:
+                    if self.stopped:
+                        break
+                    scores.append(self.objective(params, resource))
+            for params, score in zip(pending, scores):
+                self._record(params, resource, score)
+
+        return [self.cache.get((params_key(params), resource), -np.inf) for params in candidates]
+
+    def _record(self, params, resource, score):
+        score = -np.inf if score is None or np.isnan(score) else float(score)
+        self.cache[(params_key(params), resource)] = score
+        self.history.append((params, resource, score))
+        self.fits += 1
+        self.resource_used += resource
+
+        if resource >= 1.0:
+            if score > self.best_score:
+                self.best_score = score
+                self.best_params = dict(params)
+                self.since_best = 0
+                if self.verbose:
+                    print(f"New best {score:.6f} after {self.fits} fits: {params}")
+            else:
+                self.since_best += 1
+
+    def _search(self):
+        raise NotImplementedError
+
+
+class GridSearch(BaseSearch):
+    """Exhaustive search at full resource (the budget still applies)"""
+
+    def __init__(self, space, grid_points=5, **kwargs):
+        super().__init__(space, **kwargs)
+        self.grid_points = grid_points
+
+    def _search(self):
+        self.evaluate(grid_params(self.space, self.grid_points))
+
+
+class RandomSearch(BaseSearch):
+    """Uniform random sampling at full resource until the budget is spent"""
+
+    def __init__(self, space, n_candidates=20, **kwargs):
+        super().__init__(space, **kwargs)
+        self.n_candidates = n_candidates
+
+    def _search(self):
+        for _ in range(self.n_candidates):
+            if self.stopped:
+                break
+            self.evaluate([sample_params(self.space, self.rng)])
+
+
+class SuccessiveHalving(BaseSearch):
+    """Start many candidates on a small resource and promote the best 1/eta each rung"""
+
+    def __init__(self, space, n_candidates=27, min_resource=1 / 9, eta=3, **kwargs):
+        super().__init__(space, **kwargs)
+        self.n_candidates = n_candidates
+        self.min_resource = min_resource
+        self.eta = eta
+
+    def initial_candidates(self, count):
+        """The full grid when it is small enough, otherwise distinct random samples"""
+        if not any(is_range(values) for values in self.space.values()):
+            grid = grid_params(self.space)
+            if len(grid) <= count:
+                return grid
+            order = self.rng.permutation(len(grid))[:count]
+            return [grid[i] for i in order]
+
+        candidates, seen = [], set()
+        for _ in range(count * 10):
+            params = sample_params(self.space, self.rng)
+            if params_key(params) not in seen:
+                seen.add(params_key(params))
+                candidates.append(params)
+            if len(candidates) == count:
+                break
+        return candidates
+
+    def halve(self, candidates, resource):
+        while candidates and not self.stopped:
+            scores = self.evaluate(candidates, resource)
+            if resource >= 1.0 or len(candidates) == 1:
+                break
+            keep = max(1, len(candidates) // self.eta)
+            order = np.argsort(scores, kind='stable')[::-1][:keep]
+            candidates = [candidates[i] for i in order]
+            resource = min(1.0, resource * self.eta)
+
+        if resource < 1.0 and candidates and not self.stopped:
+            self.evaluate(candidates[:1], 1.0)
+
+    def _search(self):
+        self.halve(self.initial_candidates(self.n_candidates), self.min_resource)
+
+
+class Hyperband(SuccessiveHalving):
+    """Successive halving brackets trading candidate count against starting resource"""
+
+    def _search(self):
+        s_max = int(math.floor(math.log(1 / self.min_resource, self.eta) + 1e-9))
+        for s in range(s_max, -1, -1):
+            if self.stopped:
+                break
+            count = int(math.ceil((s_max + 1) / (s + 1) * self.eta ** s))
+            self.halve(self.initial_candidates(count), self.eta ** -s)
+
+
+class TPESearch(BaseSearch):
+    """Sequential model-based search with Tree-structured Parzen Estimators
+
+    After n_startup random fits, the observations are split into the best
+    gamma fraction and the rest; candidates are drawn from the per-parameter
+    density of the good ones and the one maximizing l(x)/g(x) is fitted next.
+    """
+
+    def __init__(self, space, n_iter=30, n_startup=8, gamma=0.25, n_ei_candidates=24, **kwargs):
+        super().__init__(space, **kwargs)
+        self.n_iter = n_iter
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+
+    def _log_density(self, name, values, observed):
+        """Log Parzen density of values under the observed settings of one parameter"""
+        space = self.space[name]
+        if is_range(space):
+            low, high = space
+            observed = np.asarray(observed, dtype=np.float64)
+            width = (high - low) or 1.0
+            bandwidth = max(width / max(len(observed), 1) ** 0.2 / 5, width / 100)
+            # Prior kernel at the centre of the range keeps the density positive
+            centres = np.append(observed, (low + high) / 2)
+            widths = np.append(np.full(len(observed), bandwidth), width)
+            z = (np.asarray(values, dtype=np.float64)[:, None] - centres) / widths
+            density = np.exp(-0.5 * z ** 2) / widths
+            return np.log(density.mean(axis=1) + 1e-300)
+
+        counts = np.ones(len(space))
+        for value in observed:
+            counts[space.index(value)] += 1
+        probabilities = counts / counts.sum()
+        return np.log([probabilities[space.index(value)] for value in values])
+
+    def _sample_good(self, name, good, count):
+        space = self.space[name]
+        observed = [params[name] for params in good]
+        if is_range(space):
+            low, high = space
+            width = (high - low) or 1.0
+            bandwidth = max(width / max(len(observed), 1) ** 0.2 / 5, width / 100)
+            centres = self.rng.choice(observed, count)
+            values = np.clip(centres + self.rng.normal(0, bandwidth, count), low, high)
+            if isinstance(low, int) and isinstance(high, int):
+                return [int(round(v)) for v in values]
+            return [float(v) for v in values]
+
+        counts = np.ones(len(space))
+        for value in observed:
+            counts[space.index(value)] += 1
+        picks = self.rng.choice(len(space), count, p=counts / counts.sum())
+        return [space[i] for i in picks]
+
+    def suggest(self):
+        observed = [(params, score) for params, resource, score in self.history if resource >= 1.0]
+        if len(observed) < self.n_startup:
+            return sample_params(self.space, self.rng)
+
+        observed.sort(key=lambda item: item[1], reverse=True)
+        n_good = max(1, int(math.ceil(self.gamma * len(observed))))
+        good = [params for params, _ in observed[:n_good]]
+        bad = [params for params, _ in observed[n_good:]] or good
+
+        columns = {name: self._sample_good(name, good, self.n_ei_candidates) for name in self.space}
+        ratio = np.zeros(self.n_ei_candidates)
+        for name, values in columns.items():
+            ratio += self._log_density(name, values, [params[name] for params in good])
+            ratio -= self._log_density(name, values, [params[name] for params in bad])
+
+        for i in np.argsort(ratio)[::-1]:
+            params = {name: values[i] for name, values in columns.items()}
+            if (params_key(params), 1.0) not in self.cache:
+                return params
+        return sample_params(self.space, self.rng)
+
+    def _search(self):
+        for _ in range(self.n_iter):
+            if self.stopped:
+                break
+            self.evaluate([self.suggest()])
+
+
+SEARCH_BACKENDS = {
+    'grid': GridSearch,
+    'random': RandomSearch,
+    'halving': SuccessiveHalving,
+    'hyperband': Hyperband,
+    'tpe': TPESearch
+}
+
+
+def make_search(method, space, **kwargs):
+    """Instantiate a search backend by name"""
+    if method not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search method '{method}', expected one of {sorted(SEARCH_BACKENDS)}")
+    return SEARCH_BACKENDS[method](space, **kwargs)
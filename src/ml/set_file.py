@@ -0,0 +1,458 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_SECTION = 'General'
+SECTION_MARK = '====='
+OPTIMIZE_FLAGS = ('Y', 'y')
+
+# Codecs that strip the BOM on decode and write it back on encode
+BOMS = [
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16')
+]
+DEFAULT_ENCODING = 'utf-8'
+# Bytes given to chardet when the cheap checks fail
+DETECT_SAMPLE = 4096
+# Parsed tables kept by content hash
+CACHE_SIZE = 1024
+
+_cache = OrderedDict()
+# The file service parses from a thread pool; OrderedDict reordering is not thread-safe
+_cache_lock = threading.Lock()
+
+
+def parse_value(text):
+    """Typed value of a SET field: bool, int, float or the stripped string"""
+    text = text.strip()
+    lowered = text.lower()
+    if lowered == 'true':
+        return True
+    if lowered == 'false':
+        return False
+    if text and (text[0].isdigit() or text[0] in '+-.'):
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            return float(text)
+        except ValueError:
+            pass
+    return text
+
+
+def format_value(value):
+    """SET file text of a typed value"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float):
+        text = repr(value)
+        if 'e' in text:
+            text = f"{value:.10f}".rstrip('0').rstrip('.')
+        return text
+    return str(value)
+
+
+def coerce_value(value, like):
+    """value converted to the type of like, so an optimizer's 250.0 stays an int input"""
+    if isinstance(like, bool):
+        return bool(value)
+    if isinstance(like, int) and isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(like, float) and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def _value_span(line):
+    """(text before the value, text after it) of a name=value||... line"""
+    cut = line.index('=') + 1
+    end = line.find('||', cut)
+    if end < 0:
+        return line[:cut], ''
+    return line[:cut], line[end:]
+
+
+class SetParameter:
+    """One input of a SET file, converted once: name=value||start||step||stop||Y/N"""
+
+    __slots__ = ('name', 'section', 'value', 'start', 'step', 'stop', 'optimize')
+
+    def __init__(self, name, section, value, start=None, step=None, stop=None, optimize=False):
+        self.name = name
+        self.section = section
+        self.value = value
+        self.start = start
+        self.step = step
+        self.stop = stop
+        self.optimize = optimize
+
+    @property
+    def has_range(self):
+        return self.start is not None
+
+    @property
+    def is_numeric(self):
+        return isinstance(self.value, (int, float)) and not isinstance(self.value, bool)
+
+    def replace(self, **fields):
+        """Copy with some fields changed"""
+        values = {slot: getattr(self, slot) for slot in self.__slots__}
+        values.update(fields)
+        return SetParameter(**values)
+
+    def render(self):
+        """The parameter as a SET file line (without line ending)"""
+        if not self.has_range:
+            return f"{self.name}={format_value(self.value)}"
+        fields = [format_value(self.value), format_value(self.start), format_value(self.step),
+                  format_value(self.stop), 'Y' if self.optimize else 'N']
+        return f"{self.name}=" + '||'.join(fields)
+
+    def __eq__(self, other):
+        if not isinstance(other, SetParameter):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"SetParameter({self.render()!r}, section={self.section!r})"
+
+
+class SetFile:
+    """Ordered table of SET parameters with lookup by name
+
+    Variants made by with_values() share every unchanged SetParameter with
+    their parent, so diff() between a file and its variants only compares
+    the values of the parameters that are not the same object. A parsed
+    file also keeps its source lines and where each parameter came from
+    (origin), so render() can rewrite only the lines that changed.
+    """
+
+    __slots__ = ('name', 'parameters', 'index', 'line_count', 'lines', 'origin', 'newline', 'encoding')
+
+    def __init__(self, parameters=(), name=None, line_count=0, lines=None, origin=None,
+                 newline='\n', encoding=DEFAULT_ENCODING):
+        self.name = name
+        self.parameters = list(parameters)
+        self.index = {param.name: i for i, param in enumerate(self.parameters)}
+        self.line_count = line_count
+        self.lines = lines
+        self.origin = origin or {}
+        self.newline = newline
+        self.encoding = encoding
+
+    def __len__(self):
+        return len(self.parameters)
+
+    def __iter__(self):
+        return iter(self.parameters)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __getitem__(self, name):
+        return self.parameters[self.index[name]]
+
+    def get(self, name, default=None):
+        i = self.index.get(name)
+        return default if i is None else self.parameters[i].value
+
+    def set(self, name, value):
+        """Change the value of an existing parameter, or append it to the last section"""
+        i = self.index.get(name)
+        if i is None:
+            section = self.parameters[-1].section if self.parameters else DEFAULT_SECTION
+            self.index[name] = len(self.parameters)
+            self.parameters.append(SetParameter(name, section, value))
+        else:
+            param = self.parameters[i]
+            self.parameters[i] = param.replace(value=coerce_value(value, param.value))
+
+    def values(self):
+        """{name: typed value}"""
+        return {param.name: param.value for param in self.parameters}
+
+    def sections(self):
+        """{section: [parameter names]} in file order"""
+        sections = {}
+        for param in self.parameters:
+            sections.setdefault(param.section, []).append(param.name)
+        return sections
+
+    def ranges(self):
+        """Optimization ranges of the numeric parameters flagged Y: {name: {'current', 'min', 'step', 'max'}}"""
+        return {
+            param.name: {
+                'current': float(param.value),
+                'min': float(param.start),
+                'step': float(param.step),
+                'max': float(param.stop)
+            }
+            for param in self.parameters
+            if param.optimize and param.has_range and param.is_numeric
+        }
+
+    def with_values(self, values):
+        """Variant of this file with the given {name: value} applied"""
+        variant = SetFile(name=self.name, line_count=self.line_count, lines=self.lines, origin=self.origin,
+                          newline=self.newline, encoding=self.encoding)
+        variant.parameters = list(self.parameters)
+        variant.index = self.index.copy()
+        for name, value in values.items():
+            variant.set(name, value)
+        return variant
+
+    def diff(self, other):
+        """{name: (value here, value in other)} for every parameter that differs (None if missing)"""
+        changes = {}
+        other_params, other_index = other.parameters, other.index
+        for param in self.parameters:
+            i = other_index.get(param.name)
+            if i is None:
+                changes[param.name] = (param.value, None)
+                continue
+            theirs = other_params[i]
+            if theirs is not param and theirs.value != param.value:
+                changes[param.name] = (param.value, theirs.value)
+        for param in other_params:
+            if param.name not in self.index:
+                changes[param.name] = (None, param.value)
+        return changes
+
+    def render(self):
+        """The file as SET text
+
+        A parsed file keeps its layout (comments, sections, line endings and
+        the ||start||step||stop||Y/N fields): only the lines of changed
+        parameters are rewritten and new parameters are appended. Files
+        built in code get a section comment before each section.
+        """
+        if self.lines is not None:
+            lines = list(self.lines)
+            for param in self.parameters:
+                entry = self.origin.get(param.name)
+                if entry is None:
+                    lines.append(param.render())
+                    continue
+                number, original = entry
+                if param is original:
+                    continue
+                if (param.start, param.step, param.stop, param.optimize) == \
+                        (original.start, original.step, original.stop, original.optimize):
+                    before, after = _value_span(lines[number])
+                    lines[number] = before + format_value(param.value) + after
+                else:
+                    lines[number] = param.render()
+            return self.newline.join(lines) + self.newline
+
+        lines = []
+        section = None
+        for param in self.parameters:
+            if param.section != section:
+                section = param.section
+                lines.append(f"; {SECTION_MARK} {section} {SECTION_MARK}")
+            lines.append(param.render())
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self):
+        """{name: {'section', 'value', 'raw_line'}} with plain string values, for display"""
+        table = {}
+        for param in self.parameters:
+            entry = self.origin.get(param.name)
+            if entry is not None and entry[1] is param:
+                raw_line = self.lines[entry[0]].strip()
+                value = raw_line.partition('=')[2].split('||')[0].strip()
+            else:
+                raw_line = param.render()
+                value = format_value(param.value)
+            table[param.name] = {'section': param.section, 'value': value, 'raw_line': raw_line}
+        return table
+
+    def __repr__(self):
+        return f"SetFile({self.name!r}, {len(self.parameters)} parameters)"
+
+
+def parse_set_text(text, name=None):
+    """Parse SET file text into a SetFile
+
+    Section headers are lines containing ===== either as a ';' comment
+    ('; ===== Entry =====') or bare ('===== Entry ====='); other comment
+    lines are skipped. Values and the optional ||start||step||stop||Y/N
+    optimization fields are converted with parse_value.
+    """
+    parameters = []
+    origin = {}
+    section = DEFAULT_SECTION
+    line_count = 0
+    source = text.splitlines()
+    for number, line in enumerate(source):
+        line = line.strip()
+        if not line:
+            continue
+        line_count += 1
+        first = line[0]
+        if first == ';' or line.startswith(SECTION_MARK):
+            if SECTION_MARK in line:
+                title = line.replace(';', '').replace('=', '').strip()
+                section = title or section
+            continue
+        key, sep, rest = line.partition('=')
+        if not sep or first == '#':
+            continue
+        fields = rest.split('||')
+        if len(fields) >= 5:
+            param = SetParameter(
+                key.strip(), section, parse_value(fields[0]),
+                parse_value(fields[1]), parse_value(fields[2]), parse_value(fields[3]),
+                fields[4].strip() in OPTIMIZE_FLAGS
+            )
+        else:
+            param = SetParameter(key.strip(), section, parse_value(fields[0]))
+        parameters.append(param)
+        origin[param.name] = (number, param)
+    newline = '\r\n' if '\r\n' in text else '\n'
+    return SetFile(parameters, name=name, line_count=line_count, lines=tuple(source), origin=origin,
+                   newline=newline)
+
+
+def _utf16_without_bom(sample):
+    """UTF-16 LE/BE codec name if every other byte of the sample is NUL (ASCII text), else None"""
+    if len(sample) < 2:
+        return None
+    even, odd = sample[0::2], sample[1::2]
+    if odd.count(0) * 10 >= len(odd) * 9 and not even.count(0):
+        return 'utf-16-le'
+    if even.count(0) * 10 >= len(even) * 9 and not odd.count(0):
+        return 'utf-16-be'
+    return None
+
+
+def detect_encoding(raw):
+    """Codec of raw SET file bytes
+
+    The cheap checks come first: a BOM (MT5 saves UTF-16 LE with one),
+    BOM-less UTF-16 from the NUL pattern of the first bytes, then a strict
+    UTF-8 decode. Only bytes that are none of these go to chardet, lazily
+    imported and fed a DETECT_SAMPLE sized prefix instead of the whole file.
+    """
+    for bom, codec in BOMS:
+        if raw.startswith(bom):
+            return codec
+    codec = _utf16_without_bom(raw[:DETECT_SAMPLE])
+    if codec is not None:
+        return codec
+    try:
+        raw.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        import chardet
+        encoding = chardet.detect(raw[:DETECT_SAMPLE])['encoding']
+    except ImportError:
+        encoding = None
+    # Anything but UTF is an 8-bit code page in practice; cp1252 is MT5's ANSI default
+    return encoding or 'cp1252'
+
+
+def decode_set_bytes(raw, encoding=None):
+    """(text, codec) of raw SET file bytes, the codec detected when not given"""
+    encoding = encoding or detect_encoding(raw)
+    return raw.decode(encoding, errors='replace'), encoding
+
+
+def parse_set_bytes(raw, name=None, encoding=None):
+    """Parse raw SET file bytes, reusing the result for content seen before
+
+    Cached tables are handed out as copies, so changing the parameters of
+    one (SetFile.set) never leaks into the cache or other callers.
+    """
+    key = hashlib.blake2b(raw, digest_size=16).digest(), encoding
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+    if cached is None:
+        # Parsed outside the lock so one large file never blocks other lookups; a race only parses twice
+        text, codec = decode_set_bytes(raw, encoding)
+        cached = parse_set_text(text)
+        cached.encoding = codec
+        with _cache_lock:
+            _cache[key] = cached
+            if len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    copy = cached.with_values({})
+    copy.name = name
+    return copy
+
+
+def parse_set_file(file_path, encoding=None):
+    """Read a SET file once and parse it"""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    return parse_set_bytes(raw, name=os.path.basename(file_path), encoding=encoding)
+
+
+def write_atomic(path, data):
+    """Write bytes to path through a temp file and os.replace, so readers never see a partial file"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def write_set_file(file_path, set_file):
+    """Save a SetFile in its own layout and encoding"""
+    write_atomic(file_path, set_file.render().encode(set_file.encoding))
+
+
+class SetTemplate:
+    """A parsed SET file precompiled for rendering many variants
+
+    The text around every parameter's value is split once, so a variant is
+    a copy of the line list with only the changed values formatted in;
+    there is no per-variant SetFile, parse or diff.
+    """
+
+    def __init__(self, set_file):
+        # Reparsed from its own rendering, so edits made to set_file are part of the template
+        parsed = parse_set_text(set_file.render(), name=set_file.name)
+        self.name = set_file.name
+        self.lines = list(parsed.lines)
+        self.newline = parsed.newline
+        self.encoding = set_file.encoding
+        self.slots = {}
+        for name, (number, param) in parsed.origin.items():
+            before, after = _value_span(self.lines[number])
+            self.slots[name] = (number, before, after, param.value)
+
+    def render(self, values):
+        """SET text of the template with {name: value} applied"""
+        lines = self.lines.copy()
+        for name, value in values.items():
+            slot = self.slots.get(name)
+            if slot is None:
+                lines.append(f"{name}={format_value(value)}")
+                continue
+            number, before, after, like = slot
+            lines[number] = before + format_value(coerce_value(value, like)) + after
+        return self.newline.join(lines) + self.newline
+
+    def write_variants(self, variants, directory, file_format='{stem}_{index:05d}.set'):
+        """Write one SET file per {name: value} dict into directory, returns the paths"""
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.splitext(self.name or 'variant')[0]
+        paths = []
+        for index, values in enumerate(variants):
+            path = os.path.join(directory, file_format.format(stem=stem, index=index))
+            write_atomic(path, self.render(values).encode(self.encoding))
+            paths.append(path)
+        return paths
@@ -0,0 +1,251 @@
+import os
+import bisect
+import itertools
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from core.backtest_analyzer import TitanBacktestAnalyzer, infer_point
+from search import make_search, params_key
+
+# SET parameter names (lower case, no underscores) that map onto backtest arguments
+BACKTEST_PARAMETERS = {
+    'takeprofit': 'take_profit',
+    'tp': 'take_profit',
+    'stoploss': 'stop_loss',
+    'sl': 'stop_loss',
+    'lots': 'lots',
+    'lot': 'lots',
+    'lotsize': 'lots',
+    'maxspread': 'max_spread'
+}
+
+SHARED_COLUMNS = ['time', 'Open', 'High', 'Low', 'Close', 'signal', 'spread']
+
+# Per-process state of a sweep worker, set up once by _init_worker
+_worker = {}
+
+
+def parameter_values(spec):
+    """Inclusive start..stop values of one SET range ({'current', 'min', 'step', 'max'})"""
+    start, stop, step = spec['min'], spec['max'], spec.get('step', 0)
+    if not step or step <= 0 or stop <= start:
+        return [spec.get('current', start)]
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    values = np.round(start + step * np.arange(count), 10)
+    if all(float(v).is_integer() for v in (start, step)):
+        return [int(v) for v in values]
+    return [float(v) for v in values]
+
+
+def build_parameter_grid(ranges):
+    """Cartesian product of the optimizable SET ranges as a list of parameter dicts"""
+    names = list(ranges)
+    axes = [parameter_values(ranges[name]) for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*axes)]
+
+
+def backtest_parameter(name):
+    """Backtest argument a SET parameter maps onto, None for a strategy parameter"""
+    return BACKTEST_PARAMETERS.get(name.lower().replace('_', ''))
+
+
+def backtest_ranges(ranges):
+    """(swept, ignored): the SET ranges of backtest parameters and the names of the others"""
+    swept = {name: spec for name, spec in ranges.items() if backtest_parameter(name) is not None}
+    return swept, [name for name in ranges if name not in swept]
+
+
+def split_parameters(params):
+    """Separate backtest arguments (TP/SL/lots/spread) from strategy parameters"""
+    backtest_args, strategy_args = {}, {}
+    for name, value in params.items():
+        key = backtest_parameter(name)
+        if key is not None:
+            backtest_args[key] = value
+        else:
+            strategy_args[name] = value
+    return backtest_args, strategy_args
+
+
+def _init_worker(shm_name, rows, point, point_value, signal_func, defaults):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    table = np.ndarray((len(SHARED_COLUMNS), rows), dtype=np.float64, buffer=shm.buf)
+    columns = dict(zip(SHARED_COLUMNS, table))
+
+    index = pd.DatetimeIndex(columns['time'].astype('datetime64[s]'), name='DateTime')
+    prices = pd.DataFrame(
+        {name: columns[name] for name in ['Open', 'High', 'Low', 'Close']},
+        index=index,
+        copy=False
+    )
+    _worker.update({
+        'shm': shm,
+        'prices': prices,
+        'signals': columns['signal'],
+        'spread': columns['spread'],
+        'analyzer': TitanBacktestAnalyzer(prices, point=point, point_value=point_value),
+        'signal_func': signal_func,
+        'defaults': defaults
+    })
+
+
+def _run_batch(batch):
+    results = []
+    for params, resource in batch:
+        backtest_args, strategy_args = split_parameters(params)
+        args = dict(_worker['defaults'], **backtest_args)
+        # A partial resource backtests only the most recent share of the history
+        start = int(len(_worker['prices']) * (1 - resource))
+        if _worker['signal_func'] is not None:
+            signals = np.zeros(len(_worker['prices']))
+            signals[start:] = _worker['signal_func'](_worker['prices'].iloc[start:], **strategy_args)
+        elif start > 0:
+            signals = _worker['signals'].copy()
+            signals[:start] = 0
+        else:
+            signals = _worker['signals']
+
+        result = _worker['analyzer'].run(signals, spread=_worker['spread'], **args)
+        if result is None:
+            continue
+        # Equity curve and trade list stay in the worker, only the summary is sent back
+        summary = {key: value for key, value in result.items() if key not in ('equity', 'trades')}
+        summary['parameters'] = params
+        summary['resource'] = resource
+        results.append(summary)
+    return results
+
+
+class TitanStrategyOptimizer:
+    """Parallel sweep of EA parameter combinations over one price history
+
+    The OHLC history (plus signal and spread columns) is copied once into a
+    shared memory block that every worker process maps read-only, so nothing
+    but parameter dicts and result summaries is pickled per task. Each worker
+    builds its backtest tables once and then runs its batches.
+
+    TP/SL/lots/max-spread parameters go straight to the backtester; any other
+    SET parameter is passed to signal_func(prices, **params), which must be a
+    module-level function. Without signal_func the fixed signals array is used
+    and the other SET parameters are left out of the sweep.
+    """
+
+    def __init__(self, data, signals=None, signal_func=None, spread=0, point=None, point_value=1.0,
+                 defaults=None, metric='net_profit', max_workers=None):
+        if signals is None and signal_func is None:
+            raise ValueError("Either signals or signal_func is required")
+        self.data = data
+        self.signals = signals
+        self.signal_func = signal_func
+        self.spread = spread
+        self.point = point
+        self.point_value = point_value
+        self.defaults = defaults or {'take_profit': 100, 'stop_loss': 100, 'lots': 0.01}
+        self.metric = metric
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _create_shared_table(self):
+        rows = len(self.data)
+        shm = shared_memory.SharedMemory(create=True, size=len(SHARED_COLUMNS) * rows * 8)
+        table = np.ndarray((len(SHARED_COLUMNS), rows), dtype=np.float64, buffer=shm.buf)
+        table[0] = self.data.index.values.astype('datetime64[s]').astype(np.int64)
+        for row, name in enumerate(['Open', 'High', 'Low', 'Close'], start=1):
+            table[row] = self.data[name].to_numpy(dtype=np.float64)
+        table[5] = 0 if self.signals is None else np.asarray(self.signals, dtype=np.float64)
+        table[6] = self.spread
+        return shm
+
+    @contextmanager
+    def worker_pool(self):
+        """Process pool whose workers map the shared price table"""
+        point = self.point if self.point is not None else infer_point(self.data['Close'])
+        shm = self._create_shared_table()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(shm.name, len(self.data), point, self.point_value,
+                          self.signal_func, self.defaults)
+            ) as executor:
+                yield executor
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _submit(self, executor, tasks, batch_size=None):
+        batch_size = batch_size or max(1, min(64, len(tasks) // (self.max_workers * 8)))
+        return [
+            executor.submit(_run_batch, tasks[i:i + batch_size])
+            for i in range(0, len(tasks), batch_size)
+        ]
+
+    def iter_results(self, grid, batch_size=None):
+        """Yield result summaries as the worker batches finish"""
+        if not grid:
+            return
+        with self.worker_pool() as executor:
+            futures = self._submit(executor, [(params, 1.0) for params in grid], batch_size)
+            for future in as_completed(futures):
+                for result in future.result():
+                    yield result
+
+    def _swept_ranges(self, ranges):
+        """The SET ranges that can change a backtest
+
+        Without signal_func only the backtest parameters matter; sweeping the
+        others would repeat identical backtests that tie on the leaderboard.
+        """
+        if self.signal_func is not None:
+            return ranges
+        swept, ignored = backtest_ranges(ranges)
+        if ignored:
+            print(f"Not sweeping {', '.join(ignored)}: only a signal_func uses strategy parameters")
+        if ranges and not swept:
+            raise ValueError("None of the SET ranges change the backtest without a signal_func")
+        return swept
+
+    def optimize(self, ranges, top_n=10, callback=None):
+        """Sweep the SET ranges and return all results ranked by the metric
+
+        callback(result, leaderboard) is called as each result arrives, with
+        the current top_n results sorted best first.
+        """
+        grid = build_parameter_grid(self._swept_ranges(ranges))
+        print(f"Optimizing {len(grid)} parameter combinations on {self.max_workers} worker(s)...")
+
+        keys, ranked = [], []
+        for result in self.iter_results(grid):
+            position = bisect.bisect(keys, -result[self.metric])
+            keys.insert(position, -result[self.metric])
+            ranked.insert(position, result)
+            if callback is not None:
+                callback(result, ranked[:top_n])
+
+        print(f"Finished {len(ranked)} backtests")
+        return ranked
+
+    def search(self, ranges, method='hyperband', max_seconds=None, max_fits=None, patience=None, **kwargs):
+        """Adaptive search over the SET ranges instead of the full grid
+
+        Partial resources backtest only the most recent share of the history,
+        and every rung of a halving search is fanned out to the pool at once.
+        """
+        space = {name: parameter_values(spec) for name, spec in self._swept_ranges(ranges).items()}
+
+        with self.worker_pool() as executor:
+            def objective(tasks):
+                scores = {}
+                for future in self._submit(executor, tasks):
+                    for result in future.result():
+                        scores[(params_key(result['parameters']), result['resource'])] = result[self.metric]
+                return [scores.get((params_key(params), resource)) for params, resource in tasks]
+
+            search = make_search(method, space, max_seconds=max_seconds, max_fits=max_fits,
+                                 patience=patience, **kwargs)
+            result = search.run(objective, batch=True)
+
+        print(f"Best {self.metric} {result['best_score']:.2f} after {result['fits']} backtests "
+              f"({result['seconds']:.1f}s): {result['best_params']}")
+        return result
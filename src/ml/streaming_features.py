@@ -0,0 +1,178 @@
+from collections import deque
+import numpy as np
+from indicators import RSI_EPSILON, recurrence_powers
+
+FEATURE_COLUMNS = ['RSI', 'MA20', 'MA50', 'ATR', 'Price_Range', 'Price_Change']
+
+
+class RunningSMA:
+    """Simple moving average over a running sum of value - first value, like indicators.SMA"""
+
+    def __init__(self, period):
+        self.period = period
+        self.origin = None
+        self.total = 0.0
+        # Running sums of the last period + 1 bars, the oldest is subtracted
+        self.totals = deque([0.0], maxlen=period + 1)
+
+    def update(self, value):
+        if self.origin is None:
+            self.origin = value
+        self.total += value - self.origin
+        self.totals.append(self.total)
+        if len(self.totals) <= self.period:
+            return np.nan
+        return (self.total - self.totals[0]) / self.period + self.origin
+
+
+class WilderSmoother:
+    """Wilder moving average, one value at a time, with indicators.wilder_smooth's arithmetic
+
+    The first period values are averaged with np.sum; after that the
+    recurrence is evaluated in the closed form of linear_recurrence, block
+    by block: a running sum of value * b / a**k scaled by a**k, with the
+    block start value carried over at every block boundary.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.a = (period - 1) / period
+        self.b = 1 / period
+        self.powers = recurrence_powers(self.a) if self.a else None
+        self.factors = self.b / self.powers if self.a else None
+        self.warmup = []
+        self.value = None
+        self.carry = 0.0
+        self.partial = 0.0
+        self.position = 0
+
+    def update(self, value):
+        if self.value is None:
+            self.warmup.append(value)
+            if len(self.warmup) < self.period:
+                return np.nan
+            self.value = self.carry = np.array(self.warmup).sum() / self.period
+            self.warmup = None
+            return self.value
+        if not self.a:
+            self.value = value * self.b
+            return self.value
+
+        position = self.position
+        term = value * self.factors[position]
+        self.partial = term if position == 0 else self.partial + term
+        self.value = (self.partial + self.carry) * self.powers[position]
+        if position == len(self.powers) - 1:
+            self.carry = self.powers[-1] * self.carry + self.partial * self.powers[-1]
+            self.position = 0
+        else:
+            self.position = position + 1
+        return self.value
+
+
+class WilderRSI:
+    """Wilder-smoothed RSI matching indicators.RSI"""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_close = None
+        self.gains = WilderSmoother(period)
+        self.losses = WilderSmoother(period)
+
+    def update(self, close):
+        if self.prev_close is None:
+            self.prev_close = close
+            return np.nan
+
+        change = close - self.prev_close
+        self.prev_close = close
+        avg_gain = self.gains.update(change if change > 0 else 0.0)
+        avg_loss = self.losses.update(-change if change < 0 else 0.0)
+        if avg_gain != avg_gain:
+            return np.nan
+
+        total = avg_gain + avg_loss
+        if -RSI_EPSILON < total < RSI_EPSILON:
+            return 0.0
+        return 100.0 * (avg_gain / total)
+
+
+class WilderATR:
+    """Wilder-smoothed ATR matching indicators.ATR"""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_close = None
+        self.smoother = WilderSmoother(period)
+
+    def update(self, high, low, close):
+        prev_close = self.prev_close
+        self.prev_close = close
+        if prev_close is None:
+            return np.nan
+        true_range = max(high - low, max(abs(prev_close - high), abs(low - prev_close)))
+        return self.smoother.update(true_range)
+
+
+class StreamingFeatureEngine:
+    """Constant-time per bar version of TitanDataProcessor.create_features
+
+    Feed closed bars in order with update(); each call returns the feature row
+    for that bar in FEATURE_COLUMNS order. The indicators repeat the NumPy
+    kernels of indicators.py operation for operation (the SMA's running sum
+    of close minus the first close, the Wilder averages' np.sum seed and
+    closed-form blocks, the 1e-8 RSI zero guard), so seeding from a historical
+    frame and then streaming reproduces create_features over the same bars,
+    starting at the same first bar, bit for bit.
+    """
+
+    def __init__(self, rsi_period=14, fast_period=20, slow_period=50, atr_period=14):
+        self.rsi_period = rsi_period
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.atr_period = atr_period
+        self.feature_columns = list(FEATURE_COLUMNS)
+        self.reset()
+
+    def reset(self):
+        """Drop all indicator state"""
+        self.rsi = WilderRSI(self.rsi_period)
+        self.fast_ma = RunningSMA(self.fast_period)
+        self.slow_ma = RunningSMA(self.slow_period)
+        self.atr = WilderATR(self.atr_period)
+        self.last_close = None
+        self.bars = 0
+
+    def update(self, high, low, close):
+        """Consume one closed bar and return its feature row"""
+        if self.last_close is None:
+            price_change = np.nan
+        else:
+            price_change = close / self.last_close - 1
+        self.last_close = close
+        self.bars += 1
+
+        return np.array([
+            self.rsi.update(close),
+            self.fast_ma.update(close),
+            self.slow_ma.update(close),
+            self.atr.update(high, low, close),
+            high - low,
+            price_change
+        ])
+
+    def seed(self, data):
+        """Replay a historical OHLC frame to warm up the state, returns the last feature row"""
+        self.reset()
+        row = None
+        highs = data['High'].to_numpy(dtype=np.float64)
+        lows = data['Low'].to_numpy(dtype=np.float64)
+        closes = data['Close'].to_numpy(dtype=np.float64)
+        for high, low, close in zip(highs.tolist(), lows.tolist(), closes.tolist()):
+            row = self.update(high, low, close)
+        return row
+
+    @property
+    def is_warm(self):
+        """True once every indicator has produced a value"""
+        return self.bars > max(self.rsi_period, self.slow_period - 1, self.atr_period)
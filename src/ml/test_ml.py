@@ -1,10 +1,15 @@
 import pandas as pd
-from data_processor import TitanDataProcessor
+from datetime import timedelta
+from data_processor import TitanDataProcessor, mt5_rates_to_frame
 import os
 from model import TitanMLModel
+from model_registry import ModelRegistry, cutoff_version
 from mt5_connector import MT5Connector
 import MetaTrader5 as mt5
 
+# A registered model younger than this is reused instead of retraining
+MODEL_MAX_AGE = timedelta(days=1)
+
 def get_mt5_data(connector):
     """Fetch data from MT5 instead of CSV"""
     try:
@@ -28,15 +33,25 @@ def get_mt5_data(connector):
 
 def test_ml_pipeline():
     processor = TitanDataProcessor()
+    model = TitanMLModel()
+    registry = ModelRegistry()
     
     try:
+        # Warm start from a recent registered model, no download or retraining
+        meta = registry.load_recent("USDJPY", 'M1', MODEL_MAX_AGE, model=model, processor=processor)
+        if meta is not None:
+            print(f"\nUsing the registered model trained {meta['created']}")
+            for name, value in meta['metrics'].items():
+                print(f"{name.capitalize()}: {value:.4f}")
+            return
+        
         # Initialize MT5 connection
         connector = MT5Connector()
         if not connector.initialize_mt5():
             raise Exception("Failed to initialize MT5 connection")
         
         print("\nFetching MT5 data...")
-        df = get_mt5_data(connector)
+        df = mt5_rates_to_frame(get_mt5_data(connector))
         
         # Process features
         print("\nGenerating features...")
@@ -57,8 +72,8 @@ def test_ml_pipeline():
         
         # Train and evaluate model
         print("\nTraining model...")
-        model = TitanMLModel()
         results = model.train(training_data, y)
+        registry.save("USDJPY", 'M1', cutoff_version(df), model, processor, results)
         
         print("\nModel training results:")
         print(f"Accuracy: {results['accuracy']:.4f}")
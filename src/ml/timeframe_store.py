@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+# Bar length in minutes for the timeframes offered in the UI
+TIMEFRAME_MINUTES = {
+    'M1': 1,
+    'M5': 5,
+    'M15': 15,
+    'M30': 30,
+    'H1': 60,
+    'H4': 240,
+    'D1': 1440
+}
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _index_seconds(df):
+    return df.index.values.astype('datetime64[s]').astype(np.int64)
+
+
+def resample_ohlcv(m1, timeframe):
+    """Aggregate an M1 OHLCV frame into bars of the given timeframe
+
+    Buckets are aligned to the epoch (as MT5 aligns bars to server midnight);
+    every bucket holding at least one M1 bar becomes a bar, so weekend gaps
+    produce no empty rows. The last bar may still be forming.
+    """
+    period = TIMEFRAME_MINUTES[timeframe] * 60
+    if period == 60 or len(m1) == 0:
+        return m1[OHLCV_COLUMNS].copy()
+
+    seconds = _index_seconds(m1)
+    buckets = seconds - seconds % period
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+
+    columns = {
+        'Open': m1['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(m1['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(m1['Low'].to_numpy(), starts),
+        'Close': m1['Close'].to_numpy()[ends],
+        'Volume': np.add.reduceat(m1['Volume'].to_numpy(), starts)
+    }
+    index = pd.DatetimeIndex(buckets[starts].astype('datetime64[s]'), name=m1.index.name)
+    return pd.DataFrame(columns, index=index)
+
+
+class TimeframeStore:
+    """Per-(symbol, timeframe) bar store derived from a single M1 series
+
+    Only M1 is ever downloaded; higher timeframes are resampled on first use
+    and cached until new M1 bars arrive, at which point only the buckets
+    touched by the new bars are rebuilt.
+    """
+
+    def __init__(self):
+        self.frames = {}
+
+    def symbols(self):
+        return sorted({symbol for symbol, _ in self.frames})
+
+    def put(self, symbol, m1):
+        """Replace the M1 series of a symbol and drop its derived timeframes"""
+        for key in [key for key in self.frames if key[0] == symbol]:
+            del self.frames[key]
+        self.frames[(symbol, 'M1')] = m1.sort_index()
+
+    def append(self, symbol, bars):
+        """Add newer M1 bars and refresh the affected tail of every cached timeframe"""
+        m1 = self.frames.get((symbol, 'M1'))
+        if m1 is None:
+            self.put(symbol, bars)
+            return
+        bars = bars[bars.index > m1.index[-1]] if len(m1) else bars
+        if len(bars) == 0:
+            return
+        m1 = pd.concat([m1, bars])
+        self.frames[(symbol, 'M1')] = m1
+
+        first = bars.index[0]
+        for (key_symbol, timeframe), frame in list(self.frames.items()):
+            if key_symbol != symbol or timeframe == 'M1':
+                continue
+            # Rebuild from the bucket holding the first new bar onwards
+            period = pd.Timedelta(minutes=TIMEFRAME_MINUTES[timeframe])
+            bucket = first.floor(period)
+            tail = resample_ohlcv(m1[m1.index >= bucket], timeframe)
+            self.frames[(symbol, timeframe)] = pd.concat([frame[frame.index < bucket], tail])
+
+    def get(self, symbol, timeframe='M1'):
+        """Bars of one timeframe, resampled from M1 on first request"""
+        key = (symbol, timeframe)
+        if key not in self.frames:
+            m1 = self.frames.get((symbol, 'M1'))
+            if m1 is None:
+                raise KeyError(f"No M1 data stored for {symbol}")
+            self.frames[key] = resample_ohlcv(m1, timeframe)
+        return self.frames[key]
+
+    def aligned(self, symbol, timeframes, transform=None, columns=None):
+        """Higher-timeframe columns as-of joined onto the M1 index
+
+        Each M1 row only sees the latest higher-timeframe bar that had closed
+        by the end of that minute, so there is no look-ahead from the forming
+        bar. transform (e.g. TitanDataProcessor.create_features) is applied to
+        each timeframe before the join; columns are prefixed with the
+        timeframe name, e.g. 'H4_Close'.
+        """
+        m1 = self.get(symbol, 'M1')
+        m1_close = _index_seconds(m1) + 60
+        joined = {}
+
+        for timeframe in timeframes:
+            frame = self.get(symbol, timeframe)
+            if transform is not None:
+                frame = transform(frame)
+            if columns is not None:
+                frame = frame[columns]
+
+            period = TIMEFRAME_MINUTES[timeframe] * 60
+            bar_close = _index_seconds(frame) + period
+            # Position of the last bar closed at or before each M1 close
+            position = np.searchsorted(bar_close, m1_close, side='right') - 1
+            valid = position >= 0
+
+            for name in frame.columns:
+                values = frame[name].to_numpy(dtype=np.float64)
+                column = np.full(len(m1), np.nan)
+                column[valid] = values[position[valid]]
+                joined[f"{timeframe}_{name}"] = column
+
+        return pd.DataFrame(joined, index=m1.index)
@@ -1,18 +1,39 @@
+import numpy as np
 from data_processor import TitanDataProcessor
 from model import TitanMLModel
-from sklearn.model_selection import GridSearchCV
+from search import make_search
+from model_registry import ModelRegistry, data_hash
+from validation import out_of_fold_predict, walk_forward_splits
+from lazy_imports import lazy_import
+
+base = lazy_import('sklearn.base')
 
 class ModelTrainer:
     def __init__(self):
         self.data_processor = TitanDataProcessor()
         self.model = TitanMLModel()
+        self.registry = ModelRegistry()
+
+    def train_model(self, data, symbol=None, timeframe='M1', retrain=False):
+        """Complete training pipeline
 
-    def train_model(self, data):
-        """Complete training pipeline"""
+        With a symbol, a model already trained on exactly this data is loaded
+        from the registry instead of refitting, and a new fit is saved to it.
+        """
         try:
+            if symbol is not None:
+                key = data_hash(data)
+                if not retrain:
+                    meta = self.registry.load(symbol, timeframe, key, self.model, self.data_processor)
+                    if meta is not None:
+                        return meta['metrics']
+
             print("Processing features...")
-            # Create features and prepare data
-            processed_data = self.data_processor.create_features(data)
+            # Create features and prepare data (only new bars are computed when the symbol is known)
+            if symbol is not None:
+                processed_data = self.data_processor.create_features_cached(data, symbol, timeframe)
+            else:
+                processed_data = self.data_processor.create_features(data)
             training_data = self.data_processor.prepare_training_data(processed_data)
             
             # Define target variable (1 if price goes up, 0 if down)
@@ -22,14 +43,51 @@ class ModelTrainer:
             # Train and evaluate
             print("Training model...")
             results = self.model.train(training_data, y)
+            if symbol is not None:
+                self.registry.save(symbol, timeframe, key, self.model, self.data_processor, results)
             return results
 
         except Exception as e:
             print(f"Error in training pipeline: {str(e)}")
             return None
 
-    def optimize_parameters(self, X, y):
-        """Optimize model hyperparameters"""
+    def signals(self, data, symbol, timeframe='M1', n_splits=5, n_jobs=1, should_stop=None):
+        """Out-of-sample entry signals on data's bars: 1 buy, -1 sell, 0 not traded
+
+        Each walk-forward test block is predicted by a model fit only on the
+        bars before it (one bar apart, the label looks one bar ahead), so a
+        backtest never trades a bar the model was trained on. The first
+        training window and bars without features get 0. Features are left
+        unscaled: forest splits do not change under the scaler's per-column
+        affine map, and no statistics of later bars leak into earlier folds.
+        should_stop() is checked before every fold fit (see out_of_fold_predict).
+        """
+        features = self.data_processor.create_features_cached(data, symbol, timeframe)
+        features = features.dropna(subset=self.model.feature_columns)
+        close = features['Close'].to_numpy()
+        # The last bar has no next close to label it
+        X = features[self.model.feature_columns].to_numpy()[:-1]
+        y = (close[1:] > close[:-1]).astype(int)
+
+        splits = walk_forward_splits(len(y), n_splits, gap=1)
+        predictions = out_of_fold_predict(self.model.model, X, y, splits, n_jobs=n_jobs,
+                                          should_stop=should_stop)
+
+        tested = ~np.isnan(predictions)
+        signals = np.zeros(len(data))
+        positions = data.index.get_indexer(features.index[:-1][tested])
+        signals[positions] = np.where(predictions[tested] == 1, 1, -1)
+        return signals
+
+    def optimize_parameters(self, X, y, method='halving', max_seconds=None, max_fits=None,
+                            patience=None, validation_size=0.2):
+        """Optimize model hyperparameters
+
+        Candidates are scored on a time-ordered holdout (the last
+        validation_size of the rows); the search backend decides how much of
+        the training window each fit gets, so poor settings are dropped after
+        cheap fits on recent data only.
+        """
         try:
             print("Starting parameter optimization...")
             param_grid = {
@@ -38,15 +96,28 @@ class ModelTrainer:
                 'min_samples_split': [2, 5, 10]
             }
 
-            grid_search = GridSearchCV(
-                self.model.model,
+            features = X[self.model.feature_columns].to_numpy()
+            target = y.to_numpy() if hasattr(y, 'to_numpy') else y
+            split = int(len(features) * (1 - validation_size))
+
+            def objective(params, resource):
+                # Most recent share of the training window
+                start = split - max(int(split * resource), 1)
+                model = base.clone(self.model.model).set_params(**params)
+                model.fit(features[start:split], target[start:split])
+                return model.score(features[split:], target[split:])
+
+            search = make_search(
+                method,
                 param_grid,
-                cv=5,
-                scoring='accuracy'
+                max_seconds=max_seconds,
+                max_fits=max_fits,
+                patience=patience
             )
-
-            grid_search.fit(X[self.model.feature_columns], y)
-            return grid_search.best_params_
+            result = search.run(objective)
+            print(f"Best score {result['best_score']:.4f} after {result['fits']} fits "
+                  f"({result['seconds']:.1f}s)")
+            return result['best_params']
 
         except Exception as e:
             print(f"Error in parameter optimization: {str(e)}")
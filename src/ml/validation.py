@@ -0,0 +1,103 @@
+import numpy as np
+from lazy_imports import lazy_import
+
+joblib = lazy_import('joblib')
+base = lazy_import('sklearn.base')
+metrics = lazy_import('sklearn.metrics')
+
+
+def walk_forward_splits(n_samples, n_splits=5, min_train=None, max_train=None, gap=0):
+    """Expanding (or, with max_train, rolling) train window followed by the next test block
+
+    Yields (train, test) lists of slices; gap bars between them are skipped
+    so labels that look ahead cannot reach into the test block.
+    """
+    min_train = min_train or n_samples // (n_splits + 1)
+    test_size = (n_samples - min_train - gap) // n_splits
+    if test_size <= 0:
+        raise ValueError(f"{n_samples} samples are too few for {n_splits} walk-forward folds")
+
+    for fold in range(n_splits):
+        train_end = min_train + fold * test_size
+        train_start = max(0, train_end - max_train) if max_train else 0
+        test_start = train_end + gap
+        test_end = n_samples if fold == n_splits - 1 else test_start + test_size
+        yield [slice(train_start, train_end)], [slice(test_start, test_end)]
+
+
+def purged_kfold_splits(n_samples, n_splits=5, purge=1, embargo=0):
+    """Contiguous K-fold where purge bars before and purge + embargo bars after each test block are dropped"""
+    bounds = np.linspace(0, n_samples, n_splits + 1).astype(int).tolist()
+    for test_start, test_end in zip(bounds[:-1], bounds[1:]):
+        train = []
+        if test_start - purge > 0:
+            train.append(slice(0, test_start - purge))
+        if test_end + purge + embargo < n_samples:
+            train.append(slice(test_end + purge + embargo, n_samples))
+        yield train, [slice(test_start, test_end)]
+
+
+def take(values, slices):
+    """Rows selected by a list of slices: a view for one slice, a copy to join several"""
+    if len(slices) == 1:
+        return values[slices[0]]
+    return np.concatenate([values[part] for part in slices])
+
+
+def _fit_fold(estimator, X, y, train, test):
+    model = base.clone(estimator)
+    model.fit(take(X, train), take(y, train))
+    y_test = take(y, test)
+    predictions = model.predict(take(X, test))
+    return {
+        'train_size': sum(part.stop - part.start for part in train),
+        'test_size': len(y_test),
+        'accuracy': metrics.accuracy_score(y_test, predictions),
+        'precision': metrics.precision_score(y_test, predictions, average='weighted', zero_division=0),
+        'recall': metrics.recall_score(y_test, predictions, average='weighted', zero_division=0)
+    }
+
+
+def _predict_fold(estimator, X, y, train, test):
+    model = base.clone(estimator)
+    model.fit(take(X, train), take(y, train))
+    return test, model.predict(take(X, test))
+
+
+def out_of_fold_predict(estimator, X, y, splits, n_jobs=1, should_stop=None):
+    """Predict every test block with a clone fit only on that fold's training rows
+
+    Returns a float array over X's rows, NaN for rows that are in no test
+    block (with walk_forward_splits: the first training window and the gap).
+    With should_stop the folds are fit one at a time and should_stop() is
+    checked before each; once it returns True the remaining folds stay NaN.
+    """
+    predictions = np.full(len(X), np.nan)
+    if should_stop is None:
+        folds = joblib.Parallel(n_jobs=n_jobs, prefer='threads')(
+            joblib.delayed(_predict_fold)(estimator, X, y, train, test) for train, test in splits
+        )
+    else:
+        folds = []
+        for train, test in splits:
+            if should_stop():
+                break
+            folds.append(_predict_fold(estimator, X, y, train, test))
+    for test, fold_predictions in folds:
+        offset = 0
+        for part in test:
+            size = part.stop - part.start
+            predictions[part] = fold_predictions[offset:offset + size]
+            offset += size
+    return predictions
+
+
+def cross_validate(estimator, X, y, splits, n_jobs=1):
+    """Fit a clone of the estimator per fold (in threads) and return per-fold metrics
+
+    X and y are numpy arrays holding the features computed once over the
+    full history; folds only take slices of them.
+    """
+    return joblib.Parallel(n_jobs=n_jobs, prefer='threads')(
+        joblib.delayed(_fit_fold)(estimator, X, y, train, test) for train, test in splits
+    )
@@ -0,0 +1,91 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# How often finished files are handed to the UI, in milliseconds
+FLUSH_INTERVAL = 100
+
+
+class FileProcessingService(QObject):
+    """Runs FileHandler.process_file for many files off the GUI thread
+
+    Workers only push (path, result, error) tuples onto a deque; a QTimer on
+    the GUI thread drains it every FLUSH_INTERVAL ms and emits one
+    batch_ready with everything that finished since the last tick, so a
+    drop of hundreds of files costs a few widget updates instead of one per
+    file. cancel() drops the files that have not started yet.
+    """
+
+    # [(path, result or None, error or None)]
+    batch_ready = pyqtSignal(list)
+    # done, total
+    progress = pyqtSignal(int, int)
+    # processed, failed, cancelled
+    finished = pyqtSignal(int, int, bool)
+
+    def __init__(self, file_handler, max_workers=4, parent=None):
+        super().__init__(parent)
+        self.file_handler = file_handler
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.done = deque()
+        self.cancelled = threading.Event()
+        self.futures = []
+        self.total = 0
+        self.finished_count = 0
+        self.failed_count = 0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(FLUSH_INTERVAL)
+        self.timer.timeout.connect(self.flush)
+
+    def is_running(self):
+        return self.timer.isActive()
+
+    def process(self, files):
+        """Queue files for processing; files dropped while a run is active join it"""
+        if not self.is_running():
+            self.cancelled.clear()
+            self.futures = []
+            self.total = 0
+            self.finished_count = 0
+            self.failed_count = 0
+            self.timer.start()
+        self.total += len(files)
+        for file_path in files:
+            self.futures.append(self.executor.submit(self._process_one, file_path))
+        self.progress.emit(self.finished_count, self.total)
+
+    def _process_one(self, file_path):
+        if self.cancelled.is_set():
+            return
+        try:
+            self.done.append((file_path, self.file_handler.process_file(file_path), None))
+        except Exception as e:
+            self.done.append((file_path, None, str(e)))
+
+    def cancel(self):
+        """Skip every file that has not started; the ones in progress still report"""
+        self.cancelled.set()
+        for future in self.futures:
+            future.cancel()
+
+    def flush(self):
+        batch = []
+        while self.done:
+            batch.append(self.done.popleft())
+        if batch:
+            self.finished_count += len(batch)
+            self.failed_count += sum(1 for _, _, error in batch if error is not None)
+            self.batch_ready.emit(batch)
+            self.progress.emit(self.finished_count, self.total)
+
+        if all(future.done() for future in self.futures) and not self.done:
+            self.timer.stop()
+            self.futures = []
+            self.finished.emit(self.finished_count, self.failed_count, self.cancelled.is_set())
+
+    def shutdown(self):
+        self.cancel()
+        self.timer.stop()
+        self.executor.shutdown(wait=False)
@@ -6,11 +6,22 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QFont, QIcon
 from src.core.file_handler import FileHandler
+from src.ui.file_processing import FileProcessingService
+from src.ui.optimization_runner import OptimizationRunner
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.file_handler = FileHandler()
+        self.file_service = FileProcessingService(self.file_handler, parent=self)
+        self.file_service.batch_ready.connect(self.add_results)
+        self.file_service.progress.connect(self.update_progress)
+        self.file_service.finished.connect(self.processing_finished)
+        self.optimization_runner = OptimizationRunner(parent=self)
+        self.optimization_runner.status.connect(self.optimization_status)
+        self.optimization_runner.progress.connect(self.optimization_progress)
+        self.optimization_runner.finished.connect(self.optimization_finished)
+        self.optimization_runner.failed.connect(self.optimization_failed)
         self.init_ui()
 
     def init_ui(self):
@@ -61,9 +72,13 @@ class MainWindow(QMainWindow):
         add_button.clicked.connect(self.browse_files)
         remove_button = QPushButton("Remove")
         remove_button.clicked.connect(self.remove_selected_file)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.file_service.cancel)
         
         button_layout.addWidget(add_button)
         button_layout.addWidget(remove_button)
+        button_layout.addWidget(self.cancel_button)
         upload_layout.addLayout(button_layout)
         
         upload_group.setLayout(upload_layout)
@@ -135,8 +150,7 @@ class MainWindow(QMainWindow):
             'Timeframe': QComboBox(),
             'Lots': QDoubleSpinBox(),
             'Take Profit': QSpinBox(),
-            'Stop Loss': QSpinBox(),
-            'Max Spread': QDoubleSpinBox()
+            'Stop Loss': QSpinBox()
         }
         
         # Configure controls
@@ -146,8 +160,6 @@ class MainWindow(QMainWindow):
         self.param_controls['Lots'].setSingleStep(0.01)
         self.param_controls['Take Profit'].setRange(10, 1000)
         self.param_controls['Stop Loss'].setRange(10, 1000)
-        self.param_controls['Max Spread'].setRange(0.1, 50.0)
-        self.param_controls['Max Spread'].setSingleStep(0.1)
         
         for label, control in self.param_controls.items():
             param_layout.addRow(label + ":", control)
@@ -159,13 +171,16 @@ class MainWindow(QMainWindow):
         control_group = QGroupBox("Controls")
         control_layout = QHBoxLayout()
         
-        start_button = QPushButton("Start Optimization")
-        start_button.setStyleSheet("background-color: #4CAF50; color: white;")
-        stop_button = QPushButton("Stop")
-        stop_button.setStyleSheet("background-color: #f44336; color: white;")
+        self.start_button = QPushButton("Start Optimization")
+        self.start_button.setStyleSheet("background-color: #4CAF50; color: white;")
+        self.start_button.clicked.connect(self.start_optimization)
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setStyleSheet("background-color: #f44336; color: white;")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_optimization)
         
-        control_layout.addWidget(start_button)
-        control_layout.addWidget(stop_button)
+        control_layout.addWidget(self.start_button)
+        control_layout.addWidget(self.stop_button)
         
         control_group.setLayout(control_layout)
         layout.addWidget(control_group)
@@ -216,14 +231,92 @@ class MainWindow(QMainWindow):
             )
 
     def process_files(self, files):
-        for file_path in files:
-            try:
-                result = self.file_handler.process_file(file_path)
+        # Parsed in the background, results arrive in batches through add_results
+        if not files:
+            return
+        self.cancel_button.setEnabled(True)
+        self.file_service.process(files)
+
+    def add_results(self, batch):
+        # One repaint per batch instead of one per file
+        self.file_tree.setUpdatesEnabled(False)
+        self.analysis_text.setUpdatesEnabled(False)
+        for file_path, result, error in batch:
+            if error is None:
                 self.update_ui_with_results(result)
-                self.status_bar.showMessage(f"Successfully processed {file_path}", 3000)
-            except Exception as e:
-                self.analysis_text.append(f"Error processing file {file_path}: {str(e)}\n")
-                self.status_bar.showMessage(f"Error processing file: {str(e)}", 5000)
+            else:
+                self.analysis_text.append(f"Error processing file {file_path}: {error}\n")
+        self.analysis_text.setUpdatesEnabled(True)
+        self.file_tree.setUpdatesEnabled(True)
+        
+        file_path, result, error = batch[-1]
+        if error is None:
+            self.status_bar.showMessage(f"Successfully processed {file_path}", 3000)
+        else:
+            self.status_bar.showMessage(f"Error processing file: {error}", 5000)
+
+    def update_progress(self, done, total):
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+
+    def processing_finished(self, processed, failed, cancelled):
+        self.cancel_button.setEnabled(False)
+        state = "Cancelled after" if cancelled else "Finished"
+        self.status_bar.showMessage(f"{state} {processed} files ({failed} failed)", 5000)
+
+    def start_optimization(self):
+        # The controls are the search space: TP/SL are swept around their values
+        settings = {
+            'symbol': self.param_controls['Symbol'].currentText(),
+            'timeframe': self.param_controls['Timeframe'].currentText(),
+            'lots': self.param_controls['Lots'].value(),
+            'take_profit': self.param_controls['Take Profit'].value(),
+            'stop_loss': self.param_controls['Stop Loss'].value()
+        }
+        self.results_text.setPlainText(f"Optimizing {settings['symbol']} {settings['timeframe']}...")
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.optimization_runner.start(settings)
+
+    def stop_optimization(self):
+        self.stop_button.setEnabled(False)
+        self.status_bar.showMessage("Stopping optimization...")
+        self.optimization_runner.stop()
+
+    def optimization_status(self, message):
+        self.status_bar.showMessage(message)
+
+    def optimization_progress(self, done, total, top):
+        self.update_progress(done, total)
+        self.show_optimization_results(top, f"Best so far after {done} of {total} runs")
+
+    def optimization_finished(self, message):
+        self.update_progress(message['done'], message['total'])
+        state = "Stopped" if message['stopped'] else "Finished"
+        self.show_optimization_results(message['top'], f"{state} after {message['done']} of {message['total']} runs")
+        self.status_bar.showMessage(f"Optimization {state.lower()}", 5000)
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+
+    def optimization_failed(self, error):
+        self.results_text.append(f"Optimization error: {error}")
+        self.status_bar.showMessage(f"Optimization error: {error}", 5000)
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+
+    def show_optimization_results(self, top, header):
+        lines = [header, ""]
+        for rank, result in enumerate(top, 1):
+            params = ', '.join(f"{name}={value}" for name, value in result['parameters'].items())
+            lines.append(f"{rank:2d}. {result['net_profit']:10.2f}  PF {result['profit_factor']:.2f}  "
+                         f"trades {result['trade_count']}  win {result['win_rate']:.1%}  {params}")
+        self.results_text.setPlainText('\n'.join(lines))
+
+    def closeEvent(self, event):
+        self.file_service.shutdown()
+        self.optimization_runner.shutdown()
+        super().closeEvent(event)
 
     def update_ui_with_results(self, result):
         # Update EA information
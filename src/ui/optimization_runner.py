@@ -0,0 +1,187 @@
+import os
+import sys
+import time
+import multiprocessing
+from queue import Empty
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# The ML modules import each other flat, the optimization process puts them on its path
+ML_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml')
+
+# Seconds between best-so-far messages from the optimization process
+PUSH_INTERVAL = 0.25
+# Milliseconds between queue polls on the GUI side
+REFRESH_INTERVAL = 250
+# Results kept in the best-so-far list
+TOP_N = 10
+# Without a start setting only the most recent months of the archive are loaded
+HISTORY_MONTHS = 6
+# TP/SL are searched from half to one and a half times the value set in the UI
+SPACE_SPAN = 0.5
+SPACE_STEPS = 10
+
+
+def optimization_space(settings):
+    """SET style ranges ({'current', 'min', 'step', 'max'}) around the TP/SL set in the UI"""
+    ranges = {}
+    for name in ('take_profit', 'stop_loss'):
+        current = int(settings[name])
+        low = max(1, int(round(current * (1 - SPACE_SPAN))))
+        high = int(round(current * (1 + SPACE_SPAN)))
+        step = max(1, int(round((high - low) / SPACE_STEPS)))
+        ranges[name] = {'current': current, 'min': low, 'step': step, 'max': high}
+    return ranges
+
+
+def run_optimization(settings, queue, stop_event):
+    """Body of the optimization process
+
+    Loads the symbol's history (the last HISTORY_MONTHS months unless
+    settings has a start), resamples it to the timeframe, takes the model's
+    out-of-sample walk-forward direction predictions as entry signals and
+    backtests every TP/SL pair of optimization_space(). Messages are dicts
+    with a 'type' of status, progress, finished or error; progress carries
+    the best results so far and is sent at most every PUSH_INTERVAL seconds.
+    stop_event is checked before every walk-forward fold fit and every
+    backtest.
+    """
+    try:
+        if ML_DIR not in sys.path:
+            sys.path.insert(0, ML_DIR)
+        from history_loader import load_history, recent_start
+        from timeframe_store import resample_ohlcv
+        from trainer import ModelTrainer
+        from core.backtest_analyzer import TitanBacktestAnalyzer
+        from strategy_optimizer import build_parameter_grid, split_parameters
+
+        symbol, timeframe = settings['symbol'], settings['timeframe']
+        data_dir = settings.get('data_dir', 'data')
+        start = settings.get('start') or recent_start(symbol, HISTORY_MONTHS, settings.get('end'), data_dir)
+        queue.put({'type': 'status', 'message': f"Loading {symbol} history..."})
+        data = load_history(symbol, start, settings.get('end'), data_dir=data_dir)
+        if timeframe != 'M1':
+            data = resample_ohlcv(data, timeframe)
+
+        queue.put({'type': 'status', 'message': f"Preparing {symbol} {timeframe} model signals..."})
+        signals = ModelTrainer().signals(data, symbol, timeframe, should_stop=stop_event.is_set)
+
+        analyzer = TitanBacktestAnalyzer(data)
+        grid = build_parameter_grid(optimization_space(settings))
+        top = []
+        last_push = 0.0
+        done = 0
+        for params in grid:
+            if stop_event.is_set():
+                break
+            backtest_args, _ = split_parameters(params)
+            result = analyzer.run(signals, lots=settings['lots'], **backtest_args)
+            done += 1
+            if result is not None:
+                summary = {key: value for key, value in result.items() if key not in ('equity', 'trades')}
+                summary['parameters'] = params
+                top.append(summary)
+                top.sort(key=lambda item: item['net_profit'], reverse=True)
+                del top[TOP_N:]
+
+            now = time.monotonic()
+            if now - last_push >= PUSH_INTERVAL:
+                queue.put({'type': 'progress', 'done': done, 'total': len(grid), 'top': list(top)})
+                last_push = now
+
+        queue.put({'type': 'finished', 'done': done, 'total': len(grid), 'top': top,
+                   'stopped': stop_event.is_set()})
+    except Exception as e:
+        queue.put({'type': 'error', 'message': str(e)})
+
+
+class OptimizationRunner(QObject):
+    """Runs run_optimization in its own process and relays its messages as Qt signals
+
+    The GUI thread only polls the message queue every REFRESH_INTERVAL ms
+    and forwards the newest progress message of each poll, so a fast
+    optimization never floods the event loop. stop() asks the process to
+    finish after the fold fit or backtest it is running; shutdown() also
+    terminates it if it does not exit in time.
+    """
+
+    status = pyqtSignal(str)
+    # done, total, best results so far
+    progress = pyqtSignal(int, int, list)
+    # final message: done, total, top, stopped
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Spawned, not forked: the child must not inherit the Qt application state
+        self.context = multiprocessing.get_context('spawn')
+        self.process = None
+        self.queue = None
+        self.stop_event = None
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_INTERVAL)
+        self.timer.timeout.connect(self.poll)
+
+    def is_running(self):
+        return self.process is not None
+
+    def start(self, settings):
+        if self.is_running():
+            return
+        self.queue = self.context.Queue()
+        self.stop_event = self.context.Event()
+        # Not a daemon: load_history may start its own worker processes, which daemons cannot
+        self.process = self.context.Process(
+            target=run_optimization,
+            args=(settings, self.queue, self.stop_event),
+            daemon=False
+        )
+        self.process.start()
+        self.timer.start()
+
+    def stop(self):
+        if self.is_running():
+            self.stop_event.set()
+
+    def poll(self):
+        latest = None
+        while True:
+            try:
+                message = self.queue.get_nowait()
+            except Empty:
+                break
+            if message['type'] == 'progress':
+                latest = message
+            elif message['type'] == 'status':
+                self.status.emit(message['message'])
+            elif message['type'] == 'finished':
+                self._cleanup()
+                self.finished.emit(message)
+                return
+            elif message['type'] == 'error':
+                self._cleanup()
+                self.failed.emit(message['message'])
+                return
+
+        if latest is not None:
+            self.progress.emit(latest['done'], latest['total'], latest['top'])
+        if not self.process.is_alive() and self.queue.empty():
+            exitcode = self.process.exitcode
+            self._cleanup()
+            self.failed.emit(f"Optimization process exited with code {exitcode}")
+
+    def _cleanup(self):
+        self.timer.stop()
+        if self.process is not None:
+            self.process.join(timeout=1)
+        self.process = None
+
+    def shutdown(self):
+        """Stop the optimization and give the process a moment to exit"""
+        if self.is_running():
+            self.stop_event.set()
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+            self._cleanup()
@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The MT5 and ML modules import each other flat; src/ml ends up first on the path
+for path in (os.path.join(ROOT, 'mt5_env'), os.path.join(ROOT, 'src', 'ml')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.backtest_analyzer import TitanBacktestAnalyzer
+
+POINT = 0.001
+
+
+def make_data(count=3000, seed=7):
+    """Random-walk M1 bars on a 0.001 grid, with occasional gaps between close and next open"""
+    rng = np.random.default_rng(seed)
+    jumps = np.where(rng.random(count) < 0.02, rng.integers(-200, 201, size=count), 0)
+    steps = rng.integers(-20, 21, size=count) + jumps
+    opens = 150000 + np.cumsum(steps)
+    closes = opens + rng.integers(-30, 31, size=count)
+    highs = np.maximum(opens, closes) + rng.integers(0, 40, size=count)
+    lows = np.minimum(opens, closes) - rng.integers(0, 40, size=count)
+    index = pd.date_range('2023-01-02', periods=count, freq='min', name='DateTime')
+    return pd.DataFrame({
+        'Open': opens * POINT, 'High': highs * POINT, 'Low': lows * POINT,
+        'Close': closes * POINT, 'Volume': np.ones(count)
+    }, index=index)
+
+
+def loop_backtest(data, signals, take_profit, stop_loss, max_bars, lots=0.01, max_spread=None, spread=0):
+    """Bar-by-bar reference for TitanBacktestAnalyzer.run: (entry bar, exit bar, exit reason, points) per trade"""
+    bar_open, high, low, close = (data[name].to_numpy() for name in ['Open', 'High', 'Low', 'Close'])
+    spread = np.broadcast_to(np.asarray(spread, dtype=np.float64), close.shape)
+    n = len(close)
+    trades = []
+    free_from = 0
+    for bar in range(n - 1):
+        entry = bar + 1
+        if signals[bar] == 0 or entry < free_from:
+            continue
+        if max_spread is not None and spread[entry] > max_spread:
+            continue
+        direction = 1 if signals[bar] > 0 else -1
+        entry_price = bar_open[entry]
+        tp_price = entry_price + direction * take_profit * POINT
+        sl_price = entry_price - direction * stop_loss * POINT
+
+        last = min(entry + max_bars, n) - 1
+        exit_bar, reason, exit_price = last, 'time', close[last]
+        for j in range(entry, last + 1):
+            if direction > 0:
+                sl_hit, tp_hit = low[j] <= sl_price, high[j] >= tp_price
+                gap_fill = min(bar_open[j], sl_price)
+            else:
+                sl_hit, tp_hit = high[j] >= sl_price, low[j] <= tp_price
+                gap_fill = max(bar_open[j], sl_price)
+            if sl_hit:
+                exit_bar, reason, exit_price = j, 'sl', gap_fill
+                break
+            if tp_hit:
+                exit_bar, reason, exit_price = j, 'tp', tp_price
+                break
+
+        points = direction * (exit_price - entry_price) / POINT - spread[entry]
+        trades.append((entry, exit_bar, reason, points))
+        free_from = exit_bar + 1
+    return trades
+
+
+# The exit reasons each case must exercise at least once
+@pytest.mark.parametrize('take_profit, stop_loss, max_bars, reasons', [
+    (50, 50, 10080, {'tp', 'sl'}),
+    (200, 80, 10080, {'tp', 'sl'}),
+    (30, 300, 16, {'tp', 'sl', 'time'}),
+    (400, 400, 5, {'time'}),
+])
+def test_run_matches_bar_by_bar_loop(take_profit, stop_loss, max_bars, reasons):
+    data = make_data()
+    rng = np.random.default_rng(take_profit + stop_loss)
+    signals = rng.choice([-1, 0, 0, 0, 1], size=len(data))
+
+    analyzer = TitanBacktestAnalyzer(data, point=POINT, max_bars=max_bars)
+    result = analyzer.run(signals, take_profit, stop_loss)
+    expected = loop_backtest(data, signals, take_profit, stop_loss, max_bars)
+
+    trades = result['trades']
+    assert result['trade_count'] == len(expected)
+    np.testing.assert_array_equal(data.index.get_indexer(trades['entry_time']), [t[0] for t in expected])
+    np.testing.assert_array_equal(data.index.get_indexer(trades['exit_time']), [t[1] for t in expected])
+    assert list(trades['exit_reason']) == [t[2] for t in expected]
+    np.testing.assert_allclose(trades['points'], [t[3] for t in expected], atol=1e-6)
+    profit = np.array([t[3] for t in expected]) * 0.01
+    assert result['net_profit'] == pytest.approx(profit.sum())
+    assert reasons <= set(trades['exit_reason'])
+
+
+def test_run_matches_loop_with_per_bar_spread_filter():
+    data = make_data(seed=11)
+    rng = np.random.default_rng(3)
+    signals = rng.choice([-1, 0, 1], size=len(data))
+    spread = rng.integers(5, 40, size=len(data)).astype(np.float64)
+
+    analyzer = TitanBacktestAnalyzer(data, point=POINT, max_bars=600)
+    result = analyzer.run(signals, 120, 90, max_spread=20, spread=spread)
+    expected = loop_backtest(data, signals, 120, 90, 600, max_spread=20, spread=spread)
+
+    trades = result['trades']
+    np.testing.assert_array_equal(data.index.get_indexer(trades['entry_time']), [t[0] for t in expected])
+    np.testing.assert_allclose(trades['points'], [t[3] for t in expected], atol=1e-6)
+    assert (spread[[t[0] for t in expected]] <= 20).all()
+
+
+def test_run_rejects_signals_of_the_wrong_length():
+    analyzer = TitanBacktestAnalyzer(make_data(count=100), point=POINT)
+
+    assert analyzer.run(np.ones(99), 50, 50) is None
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from bar_stream import BarStream, ReplayTerminalAdapter
+
+M1 = 1
+
+RATES_DTYPE = [
+    ('time', np.int64), ('open', np.float64), ('high', np.float64), ('low', np.float64),
+    ('close', np.float64), ('tick_volume', np.uint64), ('spread', np.int32), ('real_volume', np.uint64)
+]
+
+
+class EndOfReplay(Exception):
+    pass
+
+
+def make_rates(count=300, start=1_700_000_000 // 60 * 60, gap_after=None, gap_bars=0):
+    """M1 rates, optionally with gap_bars missing minutes after bar gap_after (a weekend)"""
+    minutes = np.arange(count, dtype=np.int64)
+    if gap_after is not None:
+        minutes[gap_after + 1:] += gap_bars
+    rates = np.zeros(count, dtype=RATES_DTYPE)
+    rates['time'] = start + minutes * 60
+    rates['open'] = 150.0 + np.arange(count) * 0.001
+    rates['high'] = rates['open'] + 0.01
+    rates['low'] = rates['open'] - 0.01
+    rates['close'] = rates['open'] + 0.005
+    return rates
+
+
+def replay(rates, primed=10, start_offset=None):
+    """Stream rates through a BarStream until the replay is exhausted: (primed, delivered batches, adapter)"""
+    start_time = rates['time'][primed] + (start_offset if start_offset is not None else 5)
+    adapter = ReplayTerminalAdapter(rates, start_time=start_time)
+
+    def sleep(seconds):
+        adapter.sleep(seconds)
+        if adapter.exhausted:
+            raise EndOfReplay
+
+    stream = BarStream('USDJPY', M1, adapter=adapter, sleep=sleep)
+    first = stream.prime(primed)
+    batches = []
+    with pytest.raises(EndOfReplay):
+        for batch in stream.stream():
+            batches.append(batch)
+    return first, batches, adapter
+
+
+def test_prime_returns_closed_bars_only():
+    rates = make_rates()
+    adapter = ReplayTerminalAdapter(rates, start_time=rates['time'][20] + 30)
+    stream = BarStream('USDJPY', M1, adapter=adapter, sleep=adapter.sleep)
+
+    first = stream.prime(5)
+
+    np.testing.assert_array_equal(first['time'], rates['time'][15:20])
+    assert stream.last_time == rates['time'][19]
+
+
+def test_stream_delivers_every_closed_bar_once_in_order():
+    rates = make_rates()
+
+    first, batches, _ = replay(rates)
+
+    delivered = np.concatenate([first] + batches)
+    # The last bar is still forming when the replay ends
+    np.testing.assert_array_equal(delivered['time'], rates['time'][:-1])
+    assert all(len(batch) == 1 for batch in batches)
+
+
+def test_stream_bridges_gaps_in_the_feed():
+    rates = make_rates(gap_after=100, gap_bars=2 * 24 * 60)
+
+    first, batches, adapter = replay(rates)
+
+    delivered = np.concatenate([first] + batches)
+    np.testing.assert_array_equal(delivered['time'], rates['time'][:-1])
+    # Sleeping through the gap in max_delay steps, not one poll per second
+    assert adapter.calls < 2 * 24 * 3600 / 30 + 10 * len(rates)
+
+
+def test_stream_polls_a_few_times_per_bar():
+    rates = make_rates()
+
+    _, batches, adapter = replay(rates)
+
+    # One forming-bar request plus one range request per bar, and a few retries around the close
+    assert adapter.calls <= 5 * len(batches)
+
+
+def test_poll_returns_all_bars_closed_since_the_last_poll():
+    rates = make_rates()
+    adapter = ReplayTerminalAdapter(rates, start_time=rates['time'][10] + 5)
+    stream = BarStream('USDJPY', M1, adapter=adapter, sleep=adapter.sleep)
+    stream.prime(10)
+
+    assert len(stream.poll()) == 0
+
+    adapter.sleep(5 * 60)
+    closed = stream.poll()
+
+    np.testing.assert_array_equal(closed['time'], rates['time'][10:15])
+    assert len(stream.poll()) == 0
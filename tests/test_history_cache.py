@@ -0,0 +1,75 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from history_cache import HistoryCache
+from history_loader import load_history
+
+
+def write_month(data_dir, symbol, year, month, days=3):
+    """Monthly M1 export with one bar every 30 minutes on the first days of the month"""
+    times = pd.date_range(f"{year}-{month:02d}-01", periods=days * 48, freq='30min')
+    prices = 130 + np.arange(len(times)) * 0.001
+    frame = pd.DataFrame({
+        'Date': times.strftime('%Y.%m.%d'),
+        'Time': times.strftime('%H:%M'),
+        'Open': prices,
+        'High': prices + 0.01,
+        'Low': prices - 0.01,
+        'Close': prices + 0.005,
+        'Volume': np.arange(len(times)) % 7
+    })
+    frame.to_csv(os.path.join(data_dir, f"Standard_{symbol}_{year}_{month:02d}.csv"), header=False, index=False)
+
+
+def mapped_file(values):
+    """File behind the memmap an array is a view of, None if it owns a copy"""
+    while values is not None:
+        if isinstance(values, np.memmap) and values.filename:
+            return values.filename
+        values = values.base if isinstance(values, np.ndarray) else None
+    return None
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for month in (1, 2):
+        write_month(str(tmp_path), 'USDJPY', 2023, month)
+    return str(tmp_path)
+
+
+def test_load_month_wraps_the_cached_arrays(data_dir):
+    cache = HistoryCache(data_dir)
+    cache.ingest()
+    key = cache.keys('USDJPY')[0]
+    month_dir = os.path.join(cache.cache_dir, key)
+
+    frame = cache.load_month(key)
+
+    assert list(frame.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    for name in ('Open', 'High', 'Low', 'Close'):
+        assert mapped_file(frame[name].to_numpy()) == os.path.join(month_dir, 'prices.npy')
+    assert mapped_file(frame['Volume'].to_numpy()) == os.path.join(month_dir, 'Volume.npy')
+
+
+def test_cached_history_matches_the_csv_files(data_dir):
+    HistoryCache(data_dir).ingest()
+
+    parsed = load_history('USDJPY', data_dir=data_dir, use_cache=False)
+    cached = load_history('USDJPY', data_dir=data_dir)
+
+    pd.testing.assert_frame_equal(cached, parsed)
+    assert parsed.dtypes.tolist() == [np.float64] * 4 + [np.float32]
+
+
+@pytest.mark.parametrize('use_cache', [False, True])
+def test_date_only_end_keeps_the_whole_day(data_dir, use_cache):
+    if use_cache:
+        HistoryCache(data_dir).ingest()
+
+    day = load_history('USDJPY', '2023-01-02', '2023-01-02', data_dir=data_dir, use_cache=use_cache)
+    assert day.index[0] == pd.Timestamp('2023-01-02 00:00')
+    assert day.index[-1] == pd.Timestamp('2023-01-02 23:30')
+
+    minute = load_history('USDJPY', '2023-01-02', '2023-01-02 12:00', data_dir=data_dir, use_cache=use_cache)
+    assert minute.index[-1] == pd.Timestamp('2023-01-02 12:00')
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from model import TitanMLModel
+from model_registry import ModelRegistry
+
+
+def fitted_model(rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    model = TitanMLModel()
+    model.model_params.update(n_estimators=15, max_depth=6)
+    X = pd.DataFrame(rng.normal(size=(rows, len(model.feature_columns))), columns=model.feature_columns)
+    y = (X['RSI'] + 0.5 * X['ATR'] + rng.normal(scale=0.5, size=rows) > 0).astype(int)
+    model.model.fit(X.to_numpy(dtype=np.float32), y)
+    return model, X.to_numpy(dtype=np.float32)
+
+
+def test_warm_start_memory_maps_the_flattened_forest(tmp_path):
+    model, X = fitted_model()
+    registry = ModelRegistry(str(tmp_path))
+    registry.save('USDJPY', 'M1', '20230131T2359', model)
+
+    loaded = TitanMLModel()
+    assert registry.load('USDJPY', 'M1', model=loaded) is not None
+
+    predictor = loaded.fast_predictor
+    for name in predictor.ARRAYS:
+        assert isinstance(getattr(predictor, name), np.memmap)
+    # The reloaded estimator is recognized, predict_bar does not flatten the forest again
+    assert loaded.bar_predictor() is predictor
+
+    expected = model.model.predict_proba(X)
+    np.testing.assert_array_equal(predictor.predict_proba(X), expected)
+    for row in X[:50]:
+        np.testing.assert_array_equal(predictor.predict_proba_row(row), model.model.predict_proba(row[np.newaxis])[0])
+
+
+def test_predict_proba_bar_matches_the_forest():
+    model, X = fitted_model(seed=1)
+
+    for row in X[:50]:
+        expected = model.model.predict_proba(row[np.newaxis])[0]
+        np.testing.assert_array_equal(model.predict_proba_bar(row.astype(np.float64)), expected)
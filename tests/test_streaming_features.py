@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_processor import TitanDataProcessor
+from streaming_features import FEATURE_COLUMNS
+
+
+def random_walk(count=3000, seed=0, flat=(1200, 1400)):
+    """M1 OHLC bars with a stretch of unchanged closes (RSI's zero guard)"""
+    rng = np.random.default_rng(seed)
+    close = 130 + np.cumsum(np.round(rng.normal(scale=0.01, size=count), 3))
+    close[flat[0]:flat[1]] = close[flat[0]]
+    spread = np.abs(np.round(rng.normal(scale=0.005, size=count), 3))
+    index = pd.date_range('2023-01-02', periods=count, freq='min', name='DateTime')
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': np.ones(count)
+    }, index=index)
+
+
+@pytest.mark.parametrize('seeded', [1, 60, 2500])
+def test_streamed_rows_equal_create_features(seeded):
+    data = random_walk()
+    processor = TitanDataProcessor()
+    expected = processor.create_features(data)[FEATURE_COLUMNS].to_numpy()
+
+    rows = [processor.start_streaming(data.iloc[:seeded])]
+    for high, low, close in data[['High', 'Low', 'Close']].to_numpy()[seeded:].tolist():
+        rows.append(processor.process_bar(high, low, close))
+    streamed = np.array(rows)
+
+    # Bit for bit, NaN lead-in included
+    np.testing.assert_array_equal(streamed.view(np.int64), expected[seeded - 1:].view(np.int64))